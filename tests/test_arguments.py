@@ -0,0 +1,83 @@
+import pytest
+
+from transcoder.main import _build_parser, _clean_path_argument, _fast_parse, _tokenize_tail
+
+
+@pytest.mark.parametrize(
+    "argv",
+    [
+        [],
+        ["video.mkv"],
+        ["--rewrap"],
+        ["--transcode", "--overwrite", "--noBitmapSubs", "--dry-run"],
+        ["video.mkv", "--targetDir", "C:\\Output"],
+        ["--targetDir", "out dir", "Some Show S01E01.mkv"],
+        ["--rewrap", "--targetSizePerHour", "1200", "--targetDir", "out"],
+        ["--fileNamePattern", "<Series Name> - S<season:2 digits>E<episode:2 digits>.mkv", "show.mkv"],
+        ["--fileNamePattern", ""],
+        ["--type", "movie", "movie.mkv"],
+        ["--targetSizePerHour", "500", "--targetSizePerHour", "700"],
+        ["--jobs", "3", "--rewrap", "*.mkv"],
+        ["--about"],
+        ["--diagnose"],
+    ],
+)
+def test_fast_parse_matches_full_parser(argv):
+    assert _fast_parse(argv) == _build_parser().parse_args(argv)
+
+
+@pytest.mark.parametrize(
+    "argv",
+    [
+        ["--help"],
+        ["--rew"],
+        ["--targetDir=out"],
+        ["-h"],
+        ["a.mkv", "b.mkv"],
+        ["--targetDir"],
+        ["--targetSizePerHour", "big"],
+        ["--targetSizePerHour", "-5"],
+        ["--type", "series"],
+        ["x", "--type", "bogus", "--type", "movie"],
+        ["--jobs", "0"],
+        ["--jobs", "two"],
+    ],
+)
+def test_fast_parse_defers_to_full_parser(argv):
+    assert _fast_parse(argv) is None
+
+
+@pytest.mark.parametrize(
+    "tail,expected",
+    [
+        ("--targetDir C:\\Output", ["--targetDir", "C:\\Output"]),
+        ('--targetDir "C:\\My Videos\\" --rewrap', ["--targetDir", "C:\\My Videos\\", "--rewrap"]),
+        ("--type 'movie'  --overwrite", ["--type", "movie", "--overwrite"]),
+        ('--fileNamePattern a"b c"d', ["--fileNamePattern", "ab cd"]),
+        ('--targetDir "unterminated path', ["--targetDir", "unterminated path"]),
+        ('--noBitmapSubs ""', ["--noBitmapSubs"]),
+    ],
+)
+def test_tokenize_tail(tail, expected):
+    assert _tokenize_tail(tail) == expected
+
+
+@pytest.mark.parametrize(
+    "value,expected",
+    [
+        ('"C:\\Videos\\"', "C:\\Videos"),
+        ("C:\\Videos\"", "C:\\Videos"),
+        (" 'show.mkv' ", "show.mkv"),
+        ("/media/videos/", "/media/videos/"),
+    ],
+)
+def test_clean_path_argument(value, expected):
+    assert _clean_path_argument(value) == expected
+
+
+def test_parsed_flags_always_present():
+    # main() reads these as plain attributes, so both parsers must always set them
+    for args in (_fast_parse([]), _build_parser().parse_args(["--targetDir=out"])):
+        assert not args.about
+        assert not args.noBitmapSubs
+        assert not args.dry_run
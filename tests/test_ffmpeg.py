@@ -0,0 +1,163 @@
+import sys
+from collections import deque
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("easyocr")
+pytest.importorskip("pgsrip")
+
+from transcoder.ffmpeg import (  # noqa: E402
+    _OUTPUT_ARGS,
+    _PROGRESS_FIELD_PATTERN,
+    _PROGRESS_RECORD_PATTERN,
+    _build_input_and_map_args,
+    _build_subtitle_args,
+    _move_complete_lines,
+    _move_complete_progress_records,
+    build_rewrap_command,
+    run_ffmpeg_with_progress,
+)
+from transcoder.subtitles import GeneratedSubtitle  # noqa: E402
+
+_TEXT_SUBTITLES = [(2, "eng"), (5, None)]
+_GENERATED_SUBTITLES = [GeneratedSubtitle(path=Path("ocr.srt"), language="fre", title=None)]
+_SUBTITLE_MAP_ARGS = ["-map", "0:2", "-map", "0:5", "-map", "1:s:0"]
+_SUBTITLE_CODEC_ARGS = [
+    "-c:s:0", "mov_text", "-metadata:s:s:0", "language=eng",
+    "-c:s:1", "mov_text",
+    "-c:s:2", "mov_text", "-metadata:s:s:2", "language=fre",
+]
+_HEVC_PROBE = {"streams": [{"codec_type": "video", "codec_name": "hevc"}]}
+
+
+def _records(blocks):
+    return [
+        dict(_PROGRESS_FIELD_PATTERN.findall(record))
+        for block in blocks
+        for record in _PROGRESS_RECORD_PATTERN.findall(block)
+    ]
+
+
+def test_progress_record_split_across_reads():
+    pending = bytearray(b"frame=10\nout_time=00:00:01.000000\nprogr")
+    blocks = deque()
+    assert not _move_complete_progress_records(pending, blocks)
+    assert not blocks
+
+    pending += b"ess=continue\nframe=2"
+    assert _move_complete_progress_records(pending, blocks)
+    assert _records(blocks) == [{"frame": "10", "out_time": "00:00:01.000000", "progress": "continue"}]
+    assert pending == b"frame=2"
+
+
+def test_several_records_in_one_chunk():
+    pending = bytearray(b"frame=1\nprogress=continue\nframe=2\nprogress=continue\nframe=3\n")
+    blocks = deque()
+    assert _move_complete_progress_records(pending, blocks)
+    assert len(blocks) == 1
+    assert [record["frame"] for record in _records(blocks)] == ["1", "2"]
+    assert pending == b"frame=3\n"
+
+
+def test_progress_end_record():
+    pending = bytearray(b"frame=99\r\nspeed=6.7x \r\nprogress=end\r\n")
+    blocks = deque()
+    assert _move_complete_progress_records(pending, blocks)
+    assert _records(blocks) == [{"frame": "99", "speed": "6.7x", "progress": "end"}]
+    assert not pending
+
+
+def test_stderr_lines_split_across_reads():
+    pending = bytearray(b"[mp4 @ 0x1] first\nError while decod")
+    lines = deque()
+    assert _move_complete_lines(pending, lines)
+    assert list(lines) == ["[mp4 @ 0x1] first"]
+
+    pending += b"ing\r\nsecond\n"
+    assert _move_complete_lines(pending, lines)
+    assert list(lines) == ["[mp4 @ 0x1] first", "Error while decoding\r", "second"]
+    assert not pending
+    assert not _move_complete_lines(pending, lines)
+
+
+_FAKE_FFMPEG = r"""
+import sys, time
+out, err = sys.stdout.buffer, sys.stderr.buffer
+out.write(b"frame=10\nout_time=00:00:01.000000\nprogr"); out.flush()
+err.write(b"[mp4 @ 0x1] fatal error in the middle\n"); err.flush()
+time.sleep(0.05)
+out.write(b"ess=continue\nframe=20\nout_time=00:00:02.000000\nprogress=continue\n"); out.flush()
+out.write(b"frame=30\nout_time=00:00:03.000000\nprogress=end")
+err.write(b"Fatal error without newline")
+"""
+
+
+@pytest.mark.parametrize("selectable_pipes", [True, False])
+def test_run_ffmpeg_with_progress_drains_pipes_at_eof(capsys, monkeypatch, selectable_pipes):
+    # False exercises the reader-thread fallback used on Windows
+    if selectable_pipes and sys.platform == "win32":
+        pytest.skip("pipes are not selectable on Windows")
+    monkeypatch.setattr("transcoder.ffmpeg._SELECTABLE_PIPES", selectable_pipes)
+    returncode, error_output = run_ffmpeg_with_progress(
+        [sys.executable, "-c", _FAKE_FFMPEG], total_frames=30, source_fps=10.0, output_prefix="[fake] "
+    )
+    assert returncode == 0
+    # Both stderr errors are kept, including the unterminated last line
+    assert error_output.splitlines() == ["[mp4 @ 0x1] fatal error in the middle", "Fatal error without newline"]
+    # The summary reflects the final progress=end record even though it had no trailing newline
+    out = capsys.readouterr().out
+    assert "\r" not in out
+    assert out.splitlines()[-1].startswith("[fake] 100.0% | time=00:00:03.000000 ")
+
+
+@pytest.mark.parametrize(
+    "text_subtitles,generated_subtitles,expected",
+    [
+        ([], [], ([], [])),
+        (_TEXT_SUBTITLES, _GENERATED_SUBTITLES, (_SUBTITLE_MAP_ARGS, _SUBTITLE_CODEC_ARGS)),
+        ([], _GENERATED_SUBTITLES, (["-map", "1:s:0"], ["-c:s:0", "mov_text", "-metadata:s:s:0", "language=fre"])),
+    ],
+)
+def test_build_subtitle_args(text_subtitles, generated_subtitles, expected):
+    assert _build_subtitle_args(text_subtitles, generated_subtitles) == expected
+
+
+@pytest.fixture
+def ffmpeg_path(monkeypatch):
+    monkeypatch.setattr("transcoder.ffmpeg.get_ffmpeg_path", lambda: "ffmpeg")
+
+
+def test_build_input_and_map_args(ffmpeg_path):
+    # OCR subtitle files are inputs 1..N, so the cover image comes after them
+    assert _build_input_and_map_args(Path("in.mkv"), _GENERATED_SUBTITLES, Path("cover.jpg"), _SUBTITLE_MAP_ARGS) == [
+        "ffmpeg", "-i", "in.mkv", "-i", "ocr.srt", "-i", "cover.jpg",
+        "-map", "0:v:0", "-map", "0:a:0", "-map", "2:v:0",
+        *_SUBTITLE_MAP_ARGS,
+    ]
+
+
+@pytest.mark.parametrize(
+    "text_subtitles,generated_subtitles,cover_image_path,expected_middle",
+    [
+        (
+            [], [], None,
+            ["-map", "0:v:0", "-map", "0:a:0", "-c:v:0", "copy", "-c:a", "copy", "-tag:v:0", "hvc1", "-sn"],
+        ),
+        (
+            _TEXT_SUBTITLES, _GENERATED_SUBTITLES, Path("cover.jpg"),
+            [
+                "-i", "ocr.srt", "-i", "cover.jpg",
+                "-map", "0:v:0", "-map", "0:a:0", "-map", "2:v:0", *_SUBTITLE_MAP_ARGS,
+                "-c:v:0", "copy", "-c:v:1", "mjpeg", "-disposition:v:1", "attached_pic", "-c:a", "copy",
+                *_SUBTITLE_CODEC_ARGS,
+                "-tag:v:0", "hvc1",
+            ],
+        ),
+    ],
+)
+def test_build_rewrap_command(ffmpeg_path, text_subtitles, generated_subtitles, cover_image_path, expected_middle):
+    cmd = build_rewrap_command(
+        Path("in.mkv"), Path("out.mp4"), text_subtitles, _HEVC_PROBE, generated_subtitles, None, cover_image_path
+    )
+    assert cmd == ["ffmpeg", "-i", "in.mkv", *expected_middle, *_OUTPUT_ARGS, "out.mp4"]
@@ -0,0 +1,30 @@
+import pytest
+
+pytest.importorskip("easyocr")
+pytest.importorskip("pgsrip")
+
+from transcoder.subtitles import _seconds_to_srt_time  # noqa: E402
+
+
+@pytest.mark.parametrize(
+    "secs,expected",
+    [
+        (0.0, "00:00:00,000"),
+        (1.001, "00:00:01,001"),
+        (3725.5, "01:02:05,500"),
+        (59.9996, "00:01:00,000"),
+        (3599.9999, "01:00:00,000"),
+        (100 * 3600 + 0.25, "100:00:00,250"),
+    ],
+)
+def test_seconds_to_srt_time(secs, expected):
+    assert _seconds_to_srt_time(secs) == expected
+
+
+def test_seconds_to_srt_time_keeps_millisecond_ordinals():
+    # pgsrip timestamps are millisecond ordinals / 1000.0; none may lose a millisecond
+    for ordinal in range(0, 7_200_000, 997):
+        hours, rest = divmod(ordinal, 3_600_000)
+        minutes, rest = divmod(rest, 60_000)
+        seconds, milliseconds = divmod(rest, 1000)
+        assert _seconds_to_srt_time(ordinal / 1000.0) == f"{hours:02d}:{minutes:02d}:{seconds:02d},{milliseconds:03d}"
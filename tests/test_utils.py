@@ -0,0 +1,28 @@
+import pytest
+
+from transcoder.utils import get_output_path
+
+
+@pytest.mark.parametrize("overwrite", [False, True])
+def test_get_output_path_reserves_batch_outputs(tmp_path, overwrite):
+    reserved = set()
+    outputs = [
+        get_output_path(tmp_path / name, overwrite=overwrite, reserved=reserved)
+        for name in ("Show.mkv", "Show.avi", "Show.m4v")
+    ]
+    assert [path.name for path in outputs] == ["Show.mp4", "Show_1.mp4", "Show_2.mp4"]
+    assert reserved == set(outputs)
+
+
+def test_get_output_path_skips_existing_files(tmp_path):
+    (tmp_path / "Movie.mp4").touch()
+    assert get_output_path(tmp_path / "Movie.mkv").name == "Movie_1.mp4"
+    assert get_output_path(tmp_path / "Movie.mkv", overwrite=True).name == "Movie.mp4"
+
+
+def test_get_output_path_target_dir_collision(tmp_path):
+    target_dir = tmp_path / "out"
+    reserved = set()
+    first = get_output_path(tmp_path / "a" / "Episode.mkv", target_dir, reserved=reserved)
+    second = get_output_path(tmp_path / "b" / "Episode.mkv", target_dir, reserved=reserved)
+    assert (first, second) == (target_dir / "Episode.mp4", target_dir / "Episode_1.mp4")
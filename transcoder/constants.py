@@ -43,6 +43,10 @@ TEXT_SUBTITLE_CODECS = {
     "text",
 }
 
+OCR_RECOGNITION_BATCH_SIZE = 16  # Detected text lines recognized together per EasyOCR batch
+MAX_SUBTITLE_EXTRACT_WORKERS = 4  # Concurrent ffmpeg passes extracting bitmap subtitle tracks
+MIN_OCR_FRAME_CONTRAST = 8  # Bitmap frames whose pixel values span less than this are blank
+
 # Image settings
 MAX_COVER_IMAGE_DIMENSION = 2000
 COVER_IMAGE_QUALITY = 2  # JPEG quality (0-31, lower is better)
@@ -92,8 +96,15 @@ SUPPORTED_VIDEO_FORMATS = {
 # Default values
 DEFAULT_TARGET_SIZE_MB_PER_HOUR = 900.0
 DEFAULT_EASYOCR_LANGUAGE = "en"
+DEFAULT_JOBS = 1  # Files processed in parallel
+
+# Diagnostics
+DIAGNOSTICS_SMOKE_TEST_ENV = "ONESHOT_DIAG_SMOKE"  # Set to "1" to run an EasyOCR test pass in --diagnose
 
 # Progress display
 PROGRESS_UPDATE_INTERVAL_SECONDS = 0.1
 MIN_PROGRESS_PERCENTAGE_FOR_ETA = 0.1
+MIN_SPEED_SAMPLE_INTERVAL_SECONDS = 0.05
+SPEED_SMOOTHING_FACTOR = 0.3  # Weight of the newest sample in the speed moving average
+MAX_ERROR_OUTPUT_LINES = 1000  # Most recent ffmpeg error lines kept for the failure report
 
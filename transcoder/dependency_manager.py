@@ -6,6 +6,7 @@ import subprocess
 import sys
 import urllib.request
 import zipfile
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
@@ -203,9 +204,13 @@ def ensure_all_dependencies() -> bool:
     return success
 
 
-def check_dependencies() -> tuple[bool, list[str]]:
+@lru_cache(maxsize=1)
+def check_dependencies() -> tuple[bool, tuple[str, ...]]:
     """Check if required dependencies are available.
     
+    The result is cached: failed imports of torch/easyocr/cv2 are slow to retry
+    and availability doesn't change while the process runs.
+    
     Returns:
         Tuple of (all_available, missing_deps)
     """
@@ -226,5 +231,5 @@ def check_dependencies() -> tuple[bool, list[str]]:
     except ImportError:
         missing.append("opencv-python")
     
-    return len(missing) == 0, missing
+    return len(missing) == 0, tuple(missing)
 
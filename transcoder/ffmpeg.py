@@ -16,11 +16,15 @@ You should have received a copy of the GNU General Public License
 along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
 
-import queue
+import os
 import re
+import selectors
 import subprocess
+import sys
 import threading
 import time
+from collections import deque
+from itertools import chain
 from pathlib import Path
 
 from transcoder.constants import (
@@ -38,7 +42,11 @@ from transcoder.constants import (
     FFMPEG_QUALITY_BALANCED,
     FFMPEG_QUALITY_BEST,
     MAX_COVER_IMAGE_DIMENSION,
+    MAX_ERROR_OUTPUT_LINES,
+    MIN_SPEED_SAMPLE_INTERVAL_SECONDS,
     MP4_SUBTITLE_CODEC,
+    PROGRESS_UPDATE_INTERVAL_SECONDS,
+    SPEED_SMOOTHING_FACTOR,
     VIDEO_TAG_HVC1,
 )
 from transcoder.exceptions import FFmpegError
@@ -46,39 +54,96 @@ from transcoder.metadata import EpisodeMetadata, MovieMetadata, metadata_to_ffmp
 from transcoder.subtitles import GeneratedSubtitle
 from transcoder.utils import detect_gpu_encoder, get_ffmpeg_path
 
+# Argument fragments shared by the command builders
+_MAP_VIDEO_AUDIO_ARGS = ("-map", "0:v:0", "-map", "0:a:0")
+_COVER_IMAGE_CODEC_ARGS = ("-c:v:1", "mjpeg", "-disposition:v:1", "attached_pic")
+_AUDIO_ENCODE_ARGS = ("-c:a", AUDIO_CODEC, "-b:a", f"{int(DEFAULT_AUDIO_BITRATE_KBPS)}k")
+_VIDEO_COPY_ARGS = ("-c:v:0", "copy")
+_AUDIO_COPY_ARGS = ("-c:a", "copy")
+_OUTPUT_ARGS = (
+    "-f",
+    "mp4",
+    "-movflags",
+    "+faststart",
+    "-hide_banner",  # Banner lines would only be filtered out again
+    "-loglevel",
+    FFMPEG_LOGLEVEL,  # Show info messages (for faststart detection) but suppress stats
+    "-nostats",  # Suppress default progress output
+    "-progress",
+    "pipe:1",  # Parse this for progress display
+    "-y",
+)
 
-def build_transcode_command(
+# Pipe reading: bulk reads with manual line splitting. Windows can't select() on
+# pipes, so it keeps one blocking reader thread per pipe instead.
+_PIPE_READ_SIZE = 65536
+_PIPE_BUFFER_SIZE = 1 << 20  # Linux pipe capacity requested for ffmpeg's output (default 64 KiB)
+_SELECTABLE_PIPES = sys.platform != "win32"
+
+# Encoder-specific rate control/quality arguments, resolved once at import
+_ENCODER_ARGS = {
+    ENCODER_NVENC: ("-preset", FFMPEG_PRESET_P4, "-rc", "vbr"),
+    ENCODER_AMF: ("-quality", FFMPEG_QUALITY_BALANCED, "-rc", "vbr_peak"),
+    ENCODER_QSV: ("-preset", FFMPEG_PRESET_MEDIUM, "-global_quality", FFMPEG_GLOBAL_QUALITY_QSV),
+    ENCODER_VIDEOTOOLBOX: ("-quality", FFMPEG_QUALITY_BEST),  # 0=realtime, 1=best, 2=better
+}
+_DEFAULT_ENCODER_ARGS = ("-preset", FFMPEG_PRESET_MEDIUM)
+
+# Encoders producing HEVC output that needs the hvc1 tag for Apple TV
+_HEVC_TAG_ENCODERS = frozenset({
+    ENCODER_NVENC,
+    ENCODER_AMF,
+    ENCODER_QSV,
+    ENCODER_VIDEOTOOLBOX,
+    ENCODER_CPU,
+})
+
+# ffmpeg stderr lines carrying stream info, configuration, stats or muxer chatter
+_STDERR_SKIP_TOKENS = (
+    "ffmpeg version", "built with", "configuration:", "libav",
+    "input #", "output #", "stream #", "metadata:", "duration:",
+    "encoder", "bps", "number_of", "statistics", "stream mapping",
+    "press [q]", "frame=", "fps=", "size=", "time=", "bitrate=",
+    "speed=", "[mp4 @", "packet duration", "pts has no value",
+    "muxing overhead", "elapsed=",
+)
+# ffmpeg's own messages are ASCII, so ASCII-only case folding is enough and skips
+# the Unicode case-equivalence tables
+_STDERR_PATTERN_FLAGS = re.IGNORECASE | re.ASCII
+# One case-insensitive alternation instead of a substring scan per token
+_STDERR_SKIP_PATTERN = re.compile("|".join(map(re.escape, _STDERR_SKIP_TOKENS)), _STDERR_PATTERN_FLAGS)
+_ERROR_PATTERN = re.compile("error", _STDERR_PATTERN_FLAGS)
+_FATAL_PATTERN = re.compile("fatal", _STDERR_PATTERN_FLAGS)
+_WARNING_INFO_PATTERN = re.compile("warning|info", _STDERR_PATTERN_FLAGS)
+
+# ffmpeg -progress output: key=value lines, each record closed by a progress= line
+_PROGRESS_RECORD_PATTERN = re.compile(r".*?^progress=[^\n]*$", re.MULTILINE | re.DOTALL)
+_PROGRESS_FIELD_PATTERN = re.compile(r"^[ \t]*(\w+)=([^\r\n]*?)[ \t\r]*$", re.MULTILINE)
+
+# Progress line template; bytes %-formatting runs in C and skips the str -> bytes encode step
+_PROGRESS_LINE_FORMAT = b"\r%stime=%s size=%7.1fMB speed=%5.2fx%s"
+
+
+def _build_input_and_map_args(
     input_path: Path,
-    output_path: Path,
-    video_bitrate_kbps: float,
-    subtitle_streams: list[tuple[int, str | None]],
-    encoder: str | None = None,
-    generated_subtitles: list[GeneratedSubtitle] | None = None,
-    media_metadata: EpisodeMetadata | MovieMetadata | None = None,
-    cover_image_path: Path | None = None,
+    generated_subtitles: list[GeneratedSubtitle],
+    cover_image_path: Path | None,
+    subtitle_map_args: list[str],
 ) -> list[str]:
     """
-    Build ffmpeg command for transcoding mode.
+    Build the ffmpeg prefix shared by all modes: binary, inputs, and stream maps.
     
     Args:
         input_path: Input video file path
-        output_path: Output .mp4 file path
-        video_bitrate_kbps: Target video bitrate in kbps
-        subtitle_streams: List of tuples (stream_index, language_code) for text subtitles
-        encoder: Video encoder to use (auto-detected if None)
         generated_subtitles: List of generated subtitle files from OCR
-        media_metadata: Metadata for Apple TV tags (movie or TV)
         cover_image_path: Optional path to cover image to embed as thumbnail
+        subtitle_map_args: Subtitle map arguments from _build_subtitle_args
     
     Returns:
         List of command arguments for ffmpeg
     """
-    encoder = encoder or detect_gpu_encoder()
-    generated_subtitles = generated_subtitles or []
-    
-    ffmpeg_path = get_ffmpeg_path()
     cmd = [
-        ffmpeg_path,
+        get_ffmpeg_path(),
         "-i",
         str(input_path),
     ]
@@ -88,33 +153,86 @@ def build_transcode_command(
         cmd.extend(["-i", str(gen_sub.path)])
     
     # Add cover image as input if provided
-    image_input_index = len(generated_subtitles) + 1
     if cover_image_path:
         cmd.extend(["-i", str(cover_image_path)])
     
     # Map video and audio first
-    cmd.extend([
-        "-map",
-        "0:v:0",
-        "-map",
-        "0:a:0",
-    ])
+    cmd.extend(_MAP_VIDEO_AUDIO_ARGS)
     
     # Map cover image as attached picture if provided
     if cover_image_path:
+        image_input_index = len(generated_subtitles) + 1
         cmd.extend(["-map", f"{image_input_index}:v:0"])
     
-    # Map text subtitle streams from source
-    subtitle_count = 0
-    if subtitle_streams:
-        for sub_idx, sub_lang in subtitle_streams:
-            cmd.extend(["-map", f"0:{sub_idx}"])
-            subtitle_count += 1
+    # Map text subtitle streams from source, then generated subtitle files
+    cmd.extend(subtitle_map_args)
+    
+    return cmd
+
+
+def _build_subtitle_args(
+    subtitle_streams: list[tuple[int, str | None]],
+    generated_subtitles: list[GeneratedSubtitle],
+) -> tuple[list[str], list[str]]:
+    """
+    Build map and codec/language arguments for all subtitle streams in one pass.
+    
+    Source text subtitles come first, followed by generated OCR subtitles
+    (input index 1..N). MP4 only supports mov_text, so every stream gets it.
+    
+    Args:
+        subtitle_streams: List of tuples (stream_index, language_code) for text subtitles
+        generated_subtitles: List of generated subtitle files from OCR
+    
+    Returns:
+        Tuple of (map arguments, codec arguments)
+    """
+    map_args: list[str] = []
+    codec_args: list[str] = []
+    sources = chain(
+        ((f"0:{sub_idx}", sub_lang) for sub_idx, sub_lang in subtitle_streams),
+        ((f"{input_idx}:s:0", gen_sub.language) for input_idx, gen_sub in enumerate(generated_subtitles, 1)),
+    )
+    for stream_idx, (map_spec, language) in enumerate(sources):
+        map_args.extend(["-map", map_spec])
+        codec_args.extend([f"-c:s:{stream_idx}", MP4_SUBTITLE_CODEC])
+        if language:
+            codec_args.extend([f"-metadata:s:s:{stream_idx}", f"language={language}"])
+    return map_args, codec_args
+
+
+def build_transcode_command(
+    input_path: Path,
+    output_path: Path,
+    video_bitrate_kbps: float,
+    subtitle_streams: list[tuple[int, str | None]],
+    encoder: str | None = None,
+    generated_subtitles: list[GeneratedSubtitle] | None = None,
+    media_metadata: EpisodeMetadata | MovieMetadata | None = None,
+    cover_image_path: Path | None = None,
+) -> list[str]:
+    """
+    Build ffmpeg command for transcoding mode.
+    
+    Args:
+        input_path: Input video file path
+        output_path: Output .mp4 file path
+        video_bitrate_kbps: Target video bitrate in kbps
+        subtitle_streams: List of tuples (stream_index, language_code) for text subtitles
+        encoder: Video encoder to use (auto-detected if None)
+        generated_subtitles: List of generated subtitle files from OCR
+        media_metadata: Metadata for Apple TV tags (movie or TV)
+        cover_image_path: Optional path to cover image to embed as thumbnail
+    
+    Returns:
+        List of command arguments for ffmpeg
+    """
+    encoder = encoder or detect_gpu_encoder()
+    subtitle_streams = subtitle_streams or []
+    generated_subtitles = generated_subtitles or []
     
-    # Map generated subtitle files
-    for idx, gen_sub in enumerate(generated_subtitles):
-        cmd.extend(["-map", f"{idx + 1}:s:0"])
-        subtitle_count += 1
+    subtitle_map_args, subtitle_codec_args = _build_subtitle_args(subtitle_streams, generated_subtitles)
+    cmd = _build_input_and_map_args(input_path, generated_subtitles, cover_image_path, subtitle_map_args)
     
     # Set codec for main video stream explicitly (use :0 to avoid affecting cover image)
     cmd.extend([
@@ -123,50 +241,21 @@ def build_transcode_command(
         "-b:v:0",
         f"{int(video_bitrate_kbps)}k",
     ])
-    
-    if encoder == ENCODER_NVENC:
-        cmd.extend(["-preset", FFMPEG_PRESET_P4, "-rc", "vbr"])
-    elif encoder == ENCODER_AMF:
-        cmd.extend(["-quality", FFMPEG_QUALITY_BALANCED, "-rc", "vbr_peak"])
-    elif encoder == ENCODER_QSV:
-        cmd.extend(["-preset", FFMPEG_PRESET_MEDIUM, "-global_quality", FFMPEG_GLOBAL_QUALITY_QSV])
-    elif encoder == ENCODER_VIDEOTOOLBOX:
-        cmd.extend(["-quality", FFMPEG_QUALITY_BEST])  # 0=realtime, 1=best, 2=better
-    else:
-        cmd.extend(["-preset", FFMPEG_PRESET_MEDIUM])
+    cmd.extend(_ENCODER_ARGS.get(encoder, _DEFAULT_ENCODER_ARGS))
     
     # Add HEVC tag for main video stream only (not cover image)
-    if encoder in [ENCODER_NVENC, ENCODER_AMF, ENCODER_QSV, ENCODER_VIDEOTOOLBOX, ENCODER_CPU]:
+    if encoder in _HEVC_TAG_ENCODERS:
         cmd.extend(["-tag:v:0", VIDEO_TAG_HVC1])
     
     # Set codec for cover image if provided
     if cover_image_path:
-        cmd.extend(["-c:v:1", "mjpeg"])
-        cmd.extend(["-disposition:v:1", "attached_pic"])
+        cmd.extend(_COVER_IMAGE_CODEC_ARGS)
     
-    cmd.extend([
-        "-c:a",
-        AUDIO_CODEC,
-        "-b:a",
-        f"{int(DEFAULT_AUDIO_BITRATE_KBPS)}k",
-    ])
+    cmd.extend(_AUDIO_ENCODE_ARGS)
     
     # Set codec and language metadata for all subtitle streams
-    if subtitle_count > 0:
-        stream_idx = 0
-        # Original text subtitles
-        if subtitle_streams:
-            for sub_idx, sub_lang in subtitle_streams:
-                cmd.extend(["-c:s:{}".format(stream_idx), MP4_SUBTITLE_CODEC])
-                if sub_lang:
-                    cmd.extend(["-metadata:s:s:{}".format(stream_idx), f"language={sub_lang}"])
-                stream_idx += 1
-        # Generated OCR subtitles
-        for gen_sub in generated_subtitles:
-            cmd.extend(["-c:s:{}".format(stream_idx), MP4_SUBTITLE_CODEC])
-            if gen_sub.language:
-                cmd.extend(["-metadata:s:s:{}".format(stream_idx), f"language={gen_sub.language}"])
-            stream_idx += 1
+    if subtitle_codec_args:
+        cmd.extend(subtitle_codec_args)
     else:
         cmd.append("-sn")
     
@@ -174,23 +263,21 @@ def build_transcode_command(
     if media_metadata:
         cmd.extend(metadata_to_ffmpeg_args(media_metadata))
     
-    cmd.extend([
-        "-f",
-        "mp4",
-        "-movflags",
-        "+faststart",
-        "-loglevel",
-        "info",  # Show info messages (for faststart detection) but suppress stats
-        "-nostats",  # Suppress default progress output
-        "-progress",
-        "pipe:1",  # Parse this for progress display
-        "-y",
-        str(output_path),
-    ])
+    cmd.extend(_OUTPUT_ARGS)
+    cmd.append(str(output_path))
     
     return cmd
 
 
+def _is_hevc_source(probe_data: dict | None) -> bool:
+    """Check whether the first video stream in probe data is HEVC."""
+    if probe_data and "streams" in probe_data:
+        for stream in probe_data["streams"]:
+            if stream.get("codec_type") == "video":
+                return stream.get("codec_name", "").lower() in ("hevc", "h265")
+    return False
+
+
 def build_rewrap_command(
     input_path: Path,
     output_path: Path,
@@ -215,119 +302,34 @@ def build_rewrap_command(
     Returns:
         List of command arguments for ffmpeg
     """
+    subtitle_streams = subtitle_streams or []
     generated_subtitles = generated_subtitles or []
     
-    # Build subtitle codec map from probe data (used for language metadata)
-    subtitle_codec_map = {}
-    if probe_data and "streams" in probe_data:
-        for stream in probe_data["streams"]:
-            if stream.get("codec_type") == "subtitle":
-                stream_idx = stream.get("index")
-                codec_name = stream.get("codec_name", "").lower()
-                subtitle_codec_map[stream_idx] = codec_name
-    
-    ffmpeg_path = get_ffmpeg_path()
-    cmd = [
-        ffmpeg_path,
-        "-i",
-        str(input_path),
-    ]
-    
-    # Add generated subtitle files as inputs
-    for gen_sub in generated_subtitles:
-        cmd.extend(["-i", str(gen_sub.path)])
-    
-    # Add cover image as input if provided
-    image_input_index = len(generated_subtitles) + 1
-    if cover_image_path:
-        cmd.extend(["-i", str(cover_image_path)])
-    
-    # Map video and audio first
-    cmd.extend([
-        "-map",
-        "0:v:0",
-        "-map",
-        "0:a:0",
-    ])
-    
-    # Map cover image as attached picture if provided
-    if cover_image_path:
-        cmd.extend(["-map", f"{image_input_index}:v:0"])
-    
-    # Map text subtitle streams from source
-    subtitle_count = 0
-    if subtitle_streams:
-        for sub_idx, sub_lang in subtitle_streams:
-            cmd.extend(["-map", f"0:{sub_idx}"])
-            subtitle_count += 1
-    
-    # Map generated subtitle files
-    for idx, gen_sub in enumerate(generated_subtitles):
-        cmd.extend(["-map", f"{idx + 1}:s:0"])
-        subtitle_count += 1
+    subtitle_map_args, subtitle_codec_args = _build_subtitle_args(subtitle_streams, generated_subtitles)
+    cmd = _build_input_and_map_args(input_path, generated_subtitles, cover_image_path, subtitle_map_args)
     
     # Set codecs: video copy, audio copy, image mjpeg
-    # Set codecs for all streams after mapping
+    cmd.extend(_VIDEO_COPY_ARGS)
     if cover_image_path:
-        cmd.extend([
-            "-c:v:0", "copy",
-            "-c:v:1", "mjpeg",
-            "-disposition:v:1", "attached_pic",
-        ])
-    else:
-        cmd.extend([
-            "-c:v:0", "copy",
-        ])
-    
-    cmd.extend([
-        "-c:a", "copy",
-    ])
+        cmd.extend(_COVER_IMAGE_CODEC_ARGS)
+    cmd.extend(_AUDIO_COPY_ARGS)
     
     # Set subtitle codecs (MP4 only supports mov_text)
-    subtitle_stream_idx = 0
-    if subtitle_streams:
-        for idx, (sub_idx, sub_lang) in enumerate(subtitle_streams):
-            cmd.extend(["-c:s:{}".format(subtitle_stream_idx), MP4_SUBTITLE_CODEC])
-            if sub_lang:
-                cmd.extend(["-metadata:s:s:{}".format(subtitle_stream_idx), f"language={sub_lang}"])
-            subtitle_stream_idx += 1
-    
-    # Set codecs for generated subtitle files
-    for idx, gen_sub in enumerate(generated_subtitles):
-        cmd.extend(["-c:s:{}".format(subtitle_stream_idx), MP4_SUBTITLE_CODEC])
-        if gen_sub.language:
-            cmd.extend(["-metadata:s:s:{}".format(subtitle_stream_idx), f"language={gen_sub.language}"])
-        subtitle_stream_idx += 1
+    cmd.extend(subtitle_codec_args)
     
     # Check if video codec is HEVC and add tag for Apple TV compatibility
-    if probe_data and "streams" in probe_data:
-        for stream in probe_data["streams"]:
-            if stream.get("codec_type") == "video":
-                codec_name = stream.get("codec_name", "").lower()
-                if codec_name in ["hevc", "h265"]:
-                    cmd.extend(["-tag:v:0", VIDEO_TAG_HVC1])
-                break
+    if _is_hevc_source(probe_data):
+        cmd.extend(["-tag:v:0", VIDEO_TAG_HVC1])
 
-    if subtitle_count == 0 and len(generated_subtitles) == 0:
+    if not subtitle_codec_args:
         cmd.append("-sn")
     
     # Add episode metadata if available
     if media_metadata:
         cmd.extend(metadata_to_ffmpeg_args(media_metadata))
     
-    cmd.extend([
-        "-f",
-        "mp4",
-        "-movflags",
-        "+faststart",
-        "-loglevel",
-        FFMPEG_LOGLEVEL,  # Show info messages (for faststart detection) but suppress stats
-        "-nostats",  # Suppress default progress output
-        "-progress",
-        "pipe:1",  # Parse this for progress display
-        "-y",
-        str(output_path),
-    ])
+    cmd.extend(_OUTPUT_ARGS)
+    cmd.append(str(output_path))
     
     return cmd
 
@@ -398,6 +400,97 @@ def parse_ffmpeg_progress(line: str) -> dict[str, int | float | str] | None:
     return None
 
 
+def _write_progress_line(
+    percentage_str: str,
+    time_str: str,
+    size_mb: float,
+    speed: float,
+    time_remaining_str: str = "",
+) -> None:
+    """
+    Overwrite the current terminal line with a progress update.
+    
+    Writes straight to the stdout byte buffer when one is available, falling
+    back to print() for text-only streams.
+    """
+    buffer = getattr(sys.stdout, "buffer", None)
+    if buffer is None:
+        print(f"\r{percentage_str}time={time_str} size={size_mb:7.1f}MB speed={speed:5.2f}x{time_remaining_str}", end="", flush=True)
+        return
+    
+    # Flush pending text output first so lines stay in order
+    sys.stdout.flush()
+    buffer.write(_PROGRESS_LINE_FORMAT % (
+        percentage_str.encode("ascii"),
+        time_str.encode("ascii", "replace"),
+        size_mb,
+        speed,
+        time_remaining_str.encode("ascii"),
+    ))
+    buffer.flush()
+
+
+def _is_reportable_stderr_line(line: str) -> bool:
+    """Check whether an ffmpeg stderr line is an actual error worth showing.
+    
+    Banner, stream info and statistics lines are only shown when they report an
+    error that isn't a warning; any other line is shown only for fatal errors.
+    
+    Args:
+        line: Stripped stderr line
+    
+    Returns:
+        True if the line should be printed and kept in the error output
+    """
+    if not _ERROR_PATTERN.search(line):
+        return False
+    if _STDERR_SKIP_PATTERN.search(line):
+        return not _WARNING_INFO_PATTERN.search(line)
+    return _FATAL_PATTERN.search(line) is not None
+
+
+def _move_complete_progress_records(pending: bytearray, blocks: deque[str]) -> bool:
+    """Move complete ffmpeg progress records from a pipe buffer into a block deque.
+    
+    Each record ends with a progress=continue or progress=end line, so everything
+    up to the last such line is handed over as one block.
+    
+    Args:
+        pending: Bytes read from the pipe so far; the incomplete record is kept
+        blocks: Deque receiving the decoded blocks
+    
+    Returns:
+        True if a block was moved
+    """
+    end = pending.rfind(b"\n")
+    while end >= 0:
+        line_start = pending.rfind(b"\n", 0, end) + 1
+        if pending.startswith(b"progress=", line_start):
+            blocks.append(pending[:end + 1].decode("utf-8", "replace"))
+            del pending[:end + 1]
+            return True
+        end = line_start - 1
+    return False
+
+
+def _move_complete_lines(pending: bytearray, lines: deque[str]) -> bool:
+    """Move complete newline-terminated lines from a pipe buffer into a line deque.
+    
+    Args:
+        pending: Bytes read from the pipe so far; the unterminated tail is kept
+        lines: Deque receiving the decoded lines
+    
+    Returns:
+        True if any lines were moved
+    """
+    end = pending.rfind(b"\n")
+    if end < 0:
+        return False
+    lines.extend(raw_line.decode("utf-8", "replace") for raw_line in pending[:end].split(b"\n"))
+    del pending[:end + 1]
+    return True
+
+
 def run_ffmpeg_with_progress(
     cmd: list[str],
     total_duration: float | None = None,
@@ -405,10 +498,14 @@ def run_ffmpeg_with_progress(
     input_size_bytes: int | None = None,
     total_frames: int | None = None,
     source_fps: float | None = None,
+    output_prefix: str | None = None,
 ) -> tuple[int, str]:
     """
     Run ffmpeg command and display FFmpeg's default progress output.
     
+    With output_prefix set (several files running at once), the live progress
+    line is replaced by a single prefixed summary line once ffmpeg finishes.
+    
     Args:
         cmd: ffmpeg command as list of arguments
         total_duration: Total video duration in seconds (for speed calculation in rewraps)
@@ -416,6 +513,7 @@ def run_ffmpeg_with_progress(
         input_size_bytes: Input file size in bytes (for percentage calculation in rewraps)
         total_frames: Total frame count (for percentage calculation in transcodes)
         source_fps: Source video FPS (for calculating stream time position from frame count)
+        output_prefix: Optional prefix for every printed line, e.g. "[Show.mkv] "
     
     Returns:
         Tuple of (returncode, error_output)
@@ -425,435 +523,379 @@ def run_ffmpeg_with_progress(
         cmd,
         stdout=subprocess.PIPE,  # Progress pipe (for faststart detection only)
         stderr=subprocess.PIPE,  # Default FFmpeg progress output
-        text=True,
-        bufsize=1,
     )
     
-    error_lines = []
+    if sys.platform.startswith("linux"):
+        # Larger pipes let ffmpeg write a burst of output without blocking on us
+        import fcntl
+        for pipe in (process.stdout, process.stderr):
+            try:
+                fcntl.fcntl(pipe.fileno(), fcntl.F_SETPIPE_SZ, _PIPE_BUFFER_SIZE)
+            except OSError:
+                # Above /proc/sys/fs/pipe-max-size for unprivileged users; keep the default
+                pass
+    
+    error_lines: deque[str] = deque(maxlen=MAX_ERROR_OUTPUT_LINES)  # Bounded even if ffmpeg loops on errors
     faststart_message_shown = False
-    stdout_queue = queue.Queue()  # Progress pipe
-    stderr_queue = queue.Queue()  # Errors only
+    # Single producer/consumer per pipe: deque append/popleft is atomic, no locking needed
+    progress_blocks: deque[str] = deque()  # Progress pipe, one or more complete records each
+    stderr_lines: deque[str] = deque()  # Errors only
+    data_ready = threading.Event()
     
     progress_data = {}  # Accumulate progress pipe key=value pairs
     last_frame_count = 0
     last_frame_time = None
     speed_calculated = 1.0
+    speed_measured = False  # Whether speed_calculated holds a real sample yet
     transcode_start_time = None
     rewrap_start_time = None
-    
-    def read_stdout():
-        """Read stdout (progress pipe)."""
-        for line in iter(process.stdout.readline, ''):
-            if line:
-                stdout_queue.put(line)
-        process.stdout.close()
-    
-    def read_stderr():
-        """Read stderr (errors only)."""
-        for line in iter(process.stderr.readline, ''):
-            if line:
-                stderr_queue.put(line)
-        process.stderr.close()
-    
-    # Start reading both streams in separate threads
-    stdout_thread = threading.Thread(target=read_stdout, daemon=True)
-    stderr_thread = threading.Thread(target=read_stderr, daemon=True)
-    stdout_thread.start()
-    stderr_thread.start()
-    
-    # Process lines as they come
-    while True:
-        process_done = process.poll() is not None
-        stdout_empty = stdout_queue.empty()
-        stderr_empty = stderr_queue.empty()
+    last_print_time = 0.0
+    last_progress_state = None  # Values behind the line currently on screen
+    output_fd = None  # Opened once ffmpeg creates the output file
+    
+    def get_output_size() -> int:
+        """Return the current output file size using a cached file descriptor."""
+        nonlocal output_fd
+        if output_path is None:
+            return 0
+        try:
+            if output_fd is None:
+                if not output_path.exists():
+                    return 0
+                output_fd = os.open(output_path, os.O_RDONLY)
+            return os.fstat(output_fd).st_size
+        except OSError:
+            return 0
+    
+    def handle_progress_record() -> None:
+        """Update speed estimates and redraw the progress line for a complete progress record."""
+        nonlocal last_frame_count, last_frame_time, speed_calculated, speed_measured
+        nonlocal transcode_start_time, rewrap_start_time, last_print_time, last_progress_state
         
-        # Exit if process is done and all queues are empty
-        if process_done and stdout_empty and stderr_empty:
-            break
+        # Display progress when we have frame data (for transcodes) or time data (for rewraps)
+        should_display = False
+        if total_frames and "frame" in progress_data:
+            # Transcode: display when we have frame data
+            should_display = True
+        elif input_size_bytes and ("out_time" in progress_data or "out_time_ms" in progress_data):
+            # Rewrap: display when we have time data
+            should_display = True
         
-        # Check stdout (progress pipe) - parse and display compactly
-        try:
-            line = stdout_queue.get(timeout=0.01)
-            if line:
-                line = line.strip()
-                if line and "=" in line:
-                    key, value = line.split("=", 1)
-                    progress_data[key] = value
+        # Calculate speed from frame progression if we have frame data (for transcodes)
+        if "frame" in progress_data and source_fps and source_fps > 0:
+            try:
+                current_frame = int(progress_data["frame"])
+                current_time = time.time()
+                
+                # Track start time for time remaining calculation
+                if transcode_start_time is None:
+                    transcode_start_time = current_time
+                
+                if last_frame_time is not None and last_frame_count >= 0:
+                    # Calculate speed: frames processed per second / source FPS
+                    frames_delta = current_frame - last_frame_count
+                    time_delta = current_time - last_frame_time
+                    # Only update if we have meaningful progress (short gaps are noisy even with smoothing)
+                    if time_delta > MIN_SPEED_SAMPLE_INTERVAL_SECONDS and frames_delta > 0:
+                        frames_per_second = frames_delta / time_delta
+                        calculated_speed = frames_per_second / source_fps
+                        # Only update if we got a reasonable speed value
+                        if calculated_speed > 0.01:
+                            if speed_measured:
+                                # Exponential moving average keeps the display steady between samples
+                                speed_calculated = (
+                                    SPEED_SMOOTHING_FACTOR * calculated_speed
+                                    + (1.0 - SPEED_SMOOTHING_FACTOR) * speed_calculated
+                                )
+                            else:
+                                # Seed with the first measurement rather than the 1.0 placeholder
+                                speed_calculated = calculated_speed
+                                speed_measured = True
+                
+                last_frame_count = current_frame
+                last_frame_time = current_time
+            except (ValueError, TypeError, ZeroDivisionError):
+                pass
+        
+        # Calculate speed from percentage progress if we have size data (for rewraps)
+        if input_size_bytes and input_size_bytes > 0 and total_duration and total_duration > 0:
+            try:
+                # Get current size from progress data or file
+                current_size = 0
+                for size_field in ["out_size", "total_size", "size"]:
+                    if size_field in progress_data:
+                        try:
+                            size_val = progress_data[size_field]
+                            if size_val and size_val != "N/A":
+                                current_size = int(size_val)
+                                if current_size > 0:
+                                    break
+                        except (ValueError, TypeError):
+                            continue
+                
+                # Fallback: check output file size if available
+                if current_size == 0:
+                    current_size = get_output_size()
+                
+                if current_size > 0:
+                    current_time = time.time()
                     
-                    # Display progress when we have frame data (for transcodes) or time data (for rewraps)
-                    should_display = False
-                    if total_frames and "frame" in progress_data:
-                        # Transcode: display when we have frame data
-                        should_display = True
-                    elif input_size_bytes and ("out_time" in progress_data or "out_time_ms" in progress_data):
-                        # Rewrap: display when we have time data
-                        should_display = True
+                    # Track start time for rewrap speed calculation
+                    if rewrap_start_time is None:
+                        rewrap_start_time = current_time
                     
-                    # Calculate speed from frame progression if we have frame data (for transcodes)
-                    if "frame" in progress_data and source_fps and source_fps > 0:
-                        try:
-                            current_frame = int(progress_data["frame"])
-                            current_time = time.time()
-                            
-                            # Track start time for time remaining calculation
-                            if transcode_start_time is None:
-                                transcode_start_time = current_time
-                            
-                            if last_frame_time is not None and last_frame_count >= 0:
-                                # Calculate speed: frames processed per second / source FPS
-                                frames_delta = current_frame - last_frame_count
-                                time_delta = current_time - last_frame_time
-                                # Only update if we have meaningful progress (at least 0.1 seconds elapsed)
-                                if time_delta > 0.1 and frames_delta > 0:
-                                    frames_per_second = frames_delta / time_delta
-                                    calculated_speed = frames_per_second / source_fps
-                                    # Only update if we got a reasonable speed value
-                                    if calculated_speed > 0.01:
-                                        speed_calculated = calculated_speed
-                            
-                            last_frame_count = current_frame
-                            last_frame_time = current_time
-                        except (ValueError, TypeError, ZeroDivisionError):
-                            pass
+                    # Calculate percentage progress
+                    percentage = min(100.0, (current_size / input_size_bytes) * 100.0)
                     
-                    # Calculate speed from percentage progress if we have size data (for rewraps)
-                    if input_size_bytes and input_size_bytes > 0 and total_duration and total_duration > 0:
-                        try:
-                            # Get current size from progress data or file
-                            current_size = 0
-                            for size_field in ["out_size", "total_size", "size"]:
-                                if size_field in progress_data:
-                                    try:
-                                        size_val = progress_data[size_field]
-                                        if size_val and size_val != "N/A":
-                                            current_size = int(size_val)
-                                            if current_size > 0:
-                                                break
-                                    except (ValueError, TypeError):
-                                        continue
-                            
-                            # Fallback: check output file size if available
-                            if current_size == 0 and output_path and output_path.exists():
-                                try:
-                                    current_size = output_path.stat().st_size
-                                except (OSError, AttributeError):
-                                    pass
+                    if percentage > 0.1 and rewrap_start_time is not None:
+                        elapsed_time = current_time - rewrap_start_time
+                        if elapsed_time > 0.1:
+                            # Speed = percentage progress / (elapsed_time / total_duration)
+                            # This gives us how fast we're processing relative to real-time
+                            expected_progress = (elapsed_time / total_duration) * 100.0
+                            if expected_progress > 0:
+                                calculated_speed = percentage / expected_progress
+                                # Only update if we got a reasonable speed value
+                                if calculated_speed > 0.01:
+                                    speed_calculated = calculated_speed
+            except (ValueError, TypeError, ZeroDivisionError):
+                pass
+        
+        # Throttle terminal updates; ffmpeg can emit records far faster than anyone can read
+        now = time.monotonic()
+        if should_display and progress_data.get("progress") != "end" and now - last_print_time < PROGRESS_UPDATE_INTERVAL_SECONDS:
+            should_display = False
+        
+        if not faststart_message_shown and should_display:
+            last_print_time = now
+            # Get time - prefer out_time, fallback to calculating from frame count using source FPS
+            time_str = progress_data.get("out_time", "")
+            if not time_str or time_str == "N/A":
+                # Calculate time from frame count and source FPS (not encoding FPS)
+                if total_frames and "frame" in progress_data and source_fps and source_fps > 0:
+                    try:
+                        current_frame = int(progress_data["frame"])
+                        # Use source FPS to calculate stream position, not encoding FPS
+                        seconds = current_frame / source_fps
+                        hours = int(seconds // 3600)
+                        minutes = int((seconds % 3600) // 60)
+                        secs = seconds % 60
+                        time_str = f"{hours:02d}:{minutes:02d}:{secs:06.3f}"
+                    except (ValueError, TypeError, ZeroDivisionError):
+                        time_str = "00:00:00.000"
+                else:
+                    time_str = "00:00:00.000"
+            
+            # Try to get size from progress data
+            size_bytes = 0
+            for size_field in ["out_size", "total_size", "size"]:
+                if size_field in progress_data:
+                    try:
+                        size_val = progress_data[size_field]
+                        if size_val and size_val != "N/A":
+                            size_bytes = int(size_val)
+                            if size_bytes > 0:
+                                break
+                    except (ValueError, TypeError):
+                        continue
+            
+            # Fallback: check output file size if available
+            if size_bytes == 0:
+                size_bytes = get_output_size()
+            
+            size_mb = size_bytes / (1024 * 1024) if size_bytes > 0 else 0.0
+            
+            # Use calculated speed (already computed above if frame data available)
+            # Only use default 1.0 if we truly don't have a valid speed yet
+            speed = speed_calculated if speed_calculated > 0.01 else 1.0
+            
+            # Calculate percentage for rewraps (based on file size) or transcodes (based on frame count)
+            percentage_str = ""
+            time_remaining_str = ""
+            if input_size_bytes and input_size_bytes > 0 and size_bytes > 0:
+                # Rewrap: use file size
+                percentage = min(100.0, (size_bytes / input_size_bytes) * 100.0)
+                percentage_str = f"{percentage:5.1f}% | "
+            elif total_frames and total_frames > 0 and "frame" in progress_data:
+                # Transcode: use frame count
+                try:
+                    current_frame = int(progress_data["frame"])
+                    percentage = min(100.0, (current_frame / total_frames) * 100.0)
+                    percentage_str = f"{percentage:5.1f}% | "
+                    
+                    # Calculate time remaining for transcodes
+                    if transcode_start_time is not None and percentage > 0.1:
+                        elapsed_time = time.time() - transcode_start_time
+                        if elapsed_time > 0:
+                            # Estimated total time = elapsed_time / (percentage / 100)
+                            estimated_total_time = elapsed_time / (percentage / 100.0)
+                            remaining_time = estimated_total_time - elapsed_time
                             
-                            if current_size > 0:
-                                current_time = time.time()
-                                
-                                # Track start time for rewrap speed calculation
-                                if rewrap_start_time is None:
-                                    rewrap_start_time = current_time
-                                
-                                # Calculate percentage progress
-                                percentage = min(100.0, (current_size / input_size_bytes) * 100.0)
+                            if remaining_time > 0:
+                                hours_remaining = int(remaining_time // 3600)
+                                minutes_remaining = int((remaining_time % 3600) // 60)
+                                seconds_remaining = int(remaining_time % 60)
                                 
-                                if percentage > 0.1 and rewrap_start_time is not None:
-                                    elapsed_time = current_time - rewrap_start_time
-                                    if elapsed_time > 0.1:
-                                        # Speed = percentage progress / (elapsed_time / total_duration)
-                                        # This gives us how fast we're processing relative to real-time
-                                        expected_progress = (elapsed_time / total_duration) * 100.0
-                                        if expected_progress > 0:
-                                            calculated_speed = percentage / expected_progress
-                                            # Only update if we got a reasonable speed value
-                                            if calculated_speed > 0.01:
-                                                speed_calculated = calculated_speed
-                        except (ValueError, TypeError, ZeroDivisionError):
-                            pass
-                    
-                    if not faststart_message_shown and should_display:
-                        # Get time - prefer out_time, fallback to calculating from frame count using source FPS
-                        time_str = progress_data.get("out_time", "")
-                        if not time_str or time_str == "N/A":
-                            # Calculate time from frame count and source FPS (not encoding FPS)
-                            if total_frames and "frame" in progress_data and source_fps and source_fps > 0:
-                                try:
-                                    current_frame = int(progress_data["frame"])
-                                    # Use source FPS to calculate stream position, not encoding FPS
-                                    seconds = current_frame / source_fps
-                                    hours = int(seconds // 3600)
-                                    minutes = int((seconds % 3600) // 60)
-                                    secs = seconds % 60
-                                    time_str = f"{hours:02d}:{minutes:02d}:{secs:06.3f}"
-                                except (ValueError, TypeError, ZeroDivisionError):
-                                    time_str = "00:00:00.000"
-                            else:
-                                time_str = "00:00:00.000"
-                        
-                        # Try to get size from progress data
-                        size_bytes = 0
-                        for size_field in ["out_size", "total_size", "size"]:
-                            if size_field in progress_data:
-                                try:
-                                    size_val = progress_data[size_field]
-                                    if size_val and size_val != "N/A":
-                                        size_bytes = int(size_val)
-                                        if size_bytes > 0:
-                                            break
-                                except (ValueError, TypeError):
-                                    continue
-                        
-                        # Fallback: check output file size if available
-                        if size_bytes == 0 and output_path and output_path.exists():
-                            try:
-                                size_bytes = output_path.stat().st_size
-                            except (OSError, AttributeError):
-                                pass
-                        
-                        size_mb = size_bytes / (1024 * 1024) if size_bytes > 0 else 0.0
-                        
-                        # Use calculated speed (already computed above if frame data available)
-                        # Only use default 1.0 if we truly don't have a valid speed yet
-                        speed = speed_calculated if speed_calculated > 0.01 else 1.0
-                        
-                        # Calculate percentage for rewraps (based on file size) or transcodes (based on frame count)
-                        percentage_str = ""
-                        time_remaining_str = ""
-                        if input_size_bytes and input_size_bytes > 0 and size_bytes > 0:
-                            # Rewrap: use file size
-                            percentage = min(100.0, (size_bytes / input_size_bytes) * 100.0)
-                            percentage_str = f"{percentage:5.1f}% | "
-                        elif total_frames and total_frames > 0 and "frame" in progress_data:
-                            # Transcode: use frame count
+                                if hours_remaining > 0:
+                                    time_remaining_str = f" | ETA {hours_remaining:02d}:{minutes_remaining:02d}:{seconds_remaining:02d}"
+                                else:
+                                    time_remaining_str = f" | ETA {minutes_remaining:02d}:{seconds_remaining:02d}"
+                except (ValueError, TypeError, ZeroDivisionError):
+                    pass
+            
+            # Skip the terminal write when the line would look exactly the same
+            progress_state = (percentage_str, time_str, round(size_mb, 1), round(speed, 2), time_remaining_str)
+            if progress_state != last_progress_state:
+                last_progress_state = progress_state
+                if output_prefix is None:
+                    _write_progress_line(percentage_str, time_str, size_mb, speed, time_remaining_str)
+    
+    def handle_progress_block(block: str) -> None:
+        """Parse progress pipe records in bulk and act once per record."""
+        for record in _PROGRESS_RECORD_PATTERN.findall(block):
+            progress_data.update(_PROGRESS_FIELD_PATTERN.findall(record))
+            handle_progress_record()
+    
+    def handle_stderr_line(line: str) -> None:
+        """Handle the faststart notice and report actual errors from stderr."""
+        nonlocal faststart_message_shown
+        line = line.strip()
+        if not line:
+            return
+        # Check for faststart message
+        if "Starting second pass: moving the moov atom to the beginning of the file" in line:
+            if not faststart_message_shown and output_prefix is None:
+                # Show 100% progress before faststart message
+                if "out_time" in progress_data or "out_time_ms" in progress_data:
+                    time_str = progress_data.get("out_time", "00:00:00")
+                    size_bytes = 0
+                    for size_field in ["out_size", "total_size", "size"]:
+                        if size_field in progress_data:
                             try:
-                                current_frame = int(progress_data["frame"])
-                                percentage = min(100.0, (current_frame / total_frames) * 100.0)
-                                percentage_str = f"{percentage:5.1f}% | "
-                                
-                                # Calculate time remaining for transcodes
-                                if transcode_start_time is not None and percentage > 0.1:
-                                    elapsed_time = time.time() - transcode_start_time
-                                    if elapsed_time > 0:
-                                        # Estimated total time = elapsed_time / (percentage / 100)
-                                        estimated_total_time = elapsed_time / (percentage / 100.0)
-                                        remaining_time = estimated_total_time - elapsed_time
-                                        
-                                        if remaining_time > 0:
-                                            hours_remaining = int(remaining_time // 3600)
-                                            minutes_remaining = int((remaining_time % 3600) // 60)
-                                            seconds_remaining = int(remaining_time % 60)
-                                            
-                                            if hours_remaining > 0:
-                                                time_remaining_str = f" | ETA {hours_remaining:02d}:{minutes_remaining:02d}:{seconds_remaining:02d}"
-                                            else:
-                                                time_remaining_str = f" | ETA {minutes_remaining:02d}:{seconds_remaining:02d}"
-                            except (ValueError, TypeError, ZeroDivisionError):
-                                pass
-                        
-                        print(f"\r{percentage_str}time={time_str} size={size_mb:7.1f}MB speed={speed:5.2f}x{time_remaining_str}", end="", flush=True)
-        except queue.Empty:
-            pass
-        
-        # Check stderr (errors and faststart message only)
-        try:
-            line = stderr_queue.get(timeout=0.01)
-            if line:
-                line = line.strip()
-                if line:
-                    # Check for faststart message
-                    if "Starting second pass: moving the moov atom to the beginning of the file" in line:
-                        if not faststart_message_shown:
-                            # Show 100% progress before faststart message
-                            if "out_time" in progress_data or "out_time_ms" in progress_data:
-                                time_str = progress_data.get("out_time", "00:00:00")
-                                size_bytes = 0
-                                for size_field in ["out_size", "total_size", "size"]:
-                                    if size_field in progress_data:
-                                        try:
-                                            size_val = progress_data[size_field]
-                                            if size_val and size_val != "N/A":
-                                                size_bytes = int(size_val)
-                                                if size_bytes > 0:
-                                                    break
-                                        except (ValueError, TypeError):
-                                            continue
-                                
-                                if size_bytes == 0 and output_path and output_path.exists():
-                                    try:
-                                        size_bytes = output_path.stat().st_size
-                                    except (OSError, AttributeError):
-                                        pass
-                                
-                                size_mb = size_bytes / (1024 * 1024) if size_bytes > 0 else 0.0
-                                speed_str = progress_data.get("speed", "1.0x").replace("x", "")
-                                try:
-                                    speed = float(speed_str)
-                                except (ValueError, TypeError):
-                                    speed = 1.0
-                                
-                                # Show 100% when faststart begins (main encoding/rewrapping is complete)
-                                percentage_str = "100.0% | "
-                                
-                                print(f"\r{percentage_str}time={time_str} size={size_mb:7.1f}MB speed={speed:5.2f}x", end="", flush=True)
-                                time.sleep(0.1)  # Brief pause to show 100%
-                            
-                            faststart_message_shown = True
-                            print()  # New line
-                            print("Optimizing stream for fast start...")
-                        continue  # Don't print the FFmpeg message
+                                size_val = progress_data[size_field]
+                                if size_val and size_val != "N/A":
+                                    size_bytes = int(size_val)
+                                    if size_bytes > 0:
+                                        break
+                            except (ValueError, TypeError):
+                                continue
                     
-                    # Only show actual errors (not warnings or info messages)
-                    # Filter out: stream info, metadata, configuration, warnings
-                    if any(skip in line.lower() for skip in [
-                        "ffmpeg version", "built with", "configuration:", "libav",
-                        "input #", "output #", "stream #", "metadata:", "duration:",
-                        "encoder", "bps", "number_of", "statistics", "stream mapping",
-                        "press [q]", "frame=", "fps=", "size=", "time=", "bitrate=",
-                        "speed=", "[mp4 @", "packet duration", "pts has no value",
-                        "muxing overhead", "elapsed="
-                    ]):
-                        # Suppress these info/warning lines
-                        if "error" in line.lower() and not any(warn in line.lower() for warn in ["warning", "info"]):
-                            # Only show actual errors
-                            print(line, flush=True)
-                            error_lines.append(line)
-                        continue
+                    if size_bytes == 0:
+                        size_bytes = get_output_size()
                     
-                    # Show only fatal errors
-                    if "error" in line.lower() and "fatal" in line.lower():
-                        print(line, flush=True)
-                        error_lines.append(line)
-        except queue.Empty:
-            pass
-    
-    # Ensure process has finished
-    if process.poll() is None:
-        process.wait()
-    stdout_thread.join(timeout=1)
-    stderr_thread.join(timeout=1)
-    
-    # Process any remaining stdout lines
-    while not stdout_queue.empty():
-        try:
-            line = stdout_queue.get_nowait()
-            if line:
-                line = line.strip()
-                if line and "=" in line:
-                    key, value = line.split("=", 1)
-                    progress_data[key] = value
-                    # Don't display progress after faststart message
-                    should_display = False
-                    if total_frames and "frame" in progress_data:
-                        # Transcode: display when we have frame data
-                        should_display = True
-                    elif input_size_bytes and ("out_time" in progress_data or "out_time_ms" in progress_data):
-                        # Rewrap: display when we have time data
-                        should_display = True
+                    size_mb = size_bytes / (1024 * 1024) if size_bytes > 0 else 0.0
+                    speed_str = progress_data.get("speed", "1.0x").replace("x", "")
+                    try:
+                        speed = float(speed_str)
+                    except (ValueError, TypeError):
+                        speed = 1.0
                     
-                    if not faststart_message_shown and should_display:
-                        # Get time - prefer out_time, fallback to calculating from frame count using source FPS
-                        time_str = progress_data.get("out_time", "")
-                        if not time_str or time_str == "N/A":
-                            # Calculate time from frame count and source FPS (not encoding FPS)
-                            if total_frames and "frame" in progress_data and source_fps and source_fps > 0:
-                                try:
-                                    current_frame = int(progress_data["frame"])
-                                    # Use source FPS to calculate stream position, not encoding FPS
-                                    seconds = current_frame / source_fps
-                                    hours = int(seconds // 3600)
-                                    minutes = int((seconds % 3600) // 60)
-                                    secs = seconds % 60
-                                    time_str = f"{hours:02d}:{minutes:02d}:{secs:06.3f}"
-                                except (ValueError, TypeError, ZeroDivisionError):
-                                    time_str = "00:00:00.000"
-                            else:
-                                time_str = "00:00:00.000"
-                        
-                        # Try to get size from progress data
-                        size_bytes = 0
-                        for size_field in ["out_size", "total_size", "size"]:
-                            if size_field in progress_data:
-                                try:
-                                    size_val = progress_data[size_field]
-                                    if size_val and size_val != "N/A":
-                                        size_bytes = int(size_val)
-                                        if size_bytes > 0:
-                                            break
-                                except (ValueError, TypeError):
-                                    continue
-                        
-                        # Fallback: check output file size if available
-                        if size_bytes == 0 and output_path and output_path.exists():
-                            try:
-                                size_bytes = output_path.stat().st_size
-                            except (OSError, AttributeError):
-                                pass
-                        
-                        size_mb = size_bytes / (1024 * 1024) if size_bytes > 0 else 0.0
-                        
-                        # Use calculated speed (already computed above if frame data available)
-                        # Only use default 1.0 if we truly don't have a valid speed yet
-                        speed = speed_calculated if speed_calculated > 0.01 else 1.0
-                        
-                        # Calculate percentage for rewraps (based on file size) or transcodes (based on frame count)
-                        percentage_str = ""
-                        time_remaining_str = ""
-                        if input_size_bytes and input_size_bytes > 0 and size_bytes > 0:
-                            # Rewrap: use file size
-                            percentage = min(100.0, (size_bytes / input_size_bytes) * 100.0)
-                            percentage_str = f"{percentage:5.1f}% | "
-                        elif total_frames and total_frames > 0 and "frame" in progress_data:
-                            # Transcode: use frame count
-                            try:
-                                current_frame = int(progress_data["frame"])
-                                percentage = min(100.0, (current_frame / total_frames) * 100.0)
-                                percentage_str = f"{percentage:5.1f}% | "
-                                
-                                # Calculate time remaining for transcodes
-                                if transcode_start_time is not None and percentage > 0.1:
-                                    elapsed_time = time.time() - transcode_start_time
-                                    if elapsed_time > 0:
-                                        # Estimated total time = elapsed_time / (percentage / 100)
-                                        estimated_total_time = elapsed_time / (percentage / 100.0)
-                                        remaining_time = estimated_total_time - elapsed_time
-                                        
-                                        if remaining_time > 0:
-                                            hours_remaining = int(remaining_time // 3600)
-                                            minutes_remaining = int((remaining_time % 3600) // 60)
-                                            seconds_remaining = int(remaining_time % 60)
-                                            
-                                            if hours_remaining > 0:
-                                                time_remaining_str = f" | ETA {hours_remaining:02d}:{minutes_remaining:02d}:{seconds_remaining:02d}"
-                                            else:
-                                                time_remaining_str = f" | ETA {minutes_remaining:02d}:{seconds_remaining:02d}"
-                            except (ValueError, TypeError, ZeroDivisionError):
-                                pass
-                        
-                        print(f"\r{percentage_str}time={time_str} size={size_mb:7.1f}MB speed={speed:5.2f}x{time_remaining_str}", end="", flush=True)
-        except queue.Empty:
-            break
-    
-    # Process any remaining stderr lines
-    while not stderr_queue.empty():
-        try:
-            line = stderr_queue.get_nowait()
-            if line:
-                line = line.strip()
-                if line:
-                    # Only show actual errors, filter out info/warnings
-                    if any(skip in line.lower() for skip in [
-                        "ffmpeg version", "built with", "configuration:", "libav",
-                        "input #", "output #", "stream #", "metadata:", "duration:",
-                        "encoder", "bps", "number_of", "statistics", "stream mapping",
-                        "press [q]", "frame=", "fps=", "size=", "time=", "bitrate=",
-                        "speed=", "[mp4 @", "packet duration", "pts has no value",
-                        "muxing overhead", "elapsed="
-                    ]):
-                        if "error" in line.lower() and "fatal" in line.lower():
-                            print(line, flush=True)
-                            error_lines.append(line)
-                        continue
+                    # Show 100% when faststart begins (main encoding/rewrapping is complete)
+                    percentage_str = "100.0% | "
                     
-                    if "error" in line.lower() and "fatal" in line.lower():
-                        print(line, flush=True)
-                        error_lines.append(line)
-        except queue.Empty:
-            break
-    
-    # Print newline after progress line
-    if not faststart_message_shown:
+                    _write_progress_line(percentage_str, time_str, size_mb, speed)
+                    time.sleep(0.1)  # Brief pause to show 100%
+                
+                faststart_message_shown = True
+                print()  # New line
+                print("Optimizing stream for fast start...")
+            return  # Don't print the FFmpeg message
+        
+        if _is_reportable_stderr_line(line):
+            print(f"{output_prefix or ''}{line}", flush=True)
+            error_lines.append(line)
+    
+    def read_pipe(pipe, lines: deque[str], move_complete) -> None:
+        """Read a pipe until EOF in a thread (Windows fallback)."""
+        fd = pipe.fileno()
+        pending = bytearray()
+        while chunk := os.read(fd, _PIPE_READ_SIZE):
+            pending += chunk
+            if move_complete(pending, lines):
+                data_ready.set()
+        if pending:
+            lines.append(pending.decode("utf-8", "replace"))
+        pipe.close()
+        data_ready.set()
+    
+    def pump_pipes(timeout: float | None) -> None:
+        """Read whatever the pipes have ready and queue complete lines (POSIX)."""
+        for key, _ in selector.select(timeout):
+            lines, pending, move_complete = key.data
+            try:
+                chunk = os.read(key.fd, _PIPE_READ_SIZE)
+            except BlockingIOError:
+                continue
+            if not chunk:
+                # EOF: flush a trailing line without newline and stop watching the pipe
+                selector.unregister(key.fileobj)
+                key.fileobj.close()
+                if pending:
+                    lines.append(pending.decode("utf-8", "replace"))
+                continue
+            pending += chunk
+            move_complete(pending, lines)
+    
+    # The progress pipe is handed over in whole records, stderr line by line
+    pipe_outputs = (
+        (process.stdout, progress_blocks, _move_complete_progress_records),
+        (process.stderr, stderr_lines, _move_complete_lines),
+    )
+    reader_threads = []
+    if _SELECTABLE_PIPES:
+        # Read both pipes from this thread - no reader threads or hand-off
+        selector = selectors.DefaultSelector()
+        for pipe, lines, move_complete in pipe_outputs:
+            os.set_blocking(pipe.fileno(), False)
+            selector.register(pipe, selectors.EVENT_READ, (lines, bytearray(), move_complete))
+    else:
+        for pipe, lines, move_complete in pipe_outputs:
+            reader_thread = threading.Thread(target=read_pipe, args=(pipe, lines, move_complete), daemon=True)
+            reader_thread.start()
+            reader_threads.append(reader_thread)
+    
+    def pipes_open() -> bool:
+        """Check whether either pipe can still deliver data."""
+        if _SELECTABLE_PIPES:
+            return bool(selector.get_map())
+        return any(reader_thread.is_alive() for reader_thread in reader_threads)
+    
+    try:
+        # Process lines as they come until both pipes reach EOF; checking before
+        # handling the buffered lines guarantees nothing read at the end is left over
+        while True:
+            reading = pipes_open()
+            
+            # Progress pipe first so the faststart notice sees the latest record
+            while progress_blocks:
+                handle_progress_block(progress_blocks.popleft())
+            while stderr_lines:
+                handle_stderr_line(stderr_lines.popleft())
+            
+            if not reading:
+                break
+            
+            # Wait for either pipe to deliver more data
+            if _SELECTABLE_PIPES:
+                pump_pipes(None)
+            else:
+                data_ready.wait(0.25)
+                data_ready.clear()
+        
+        process.wait()
+    finally:
+        if _SELECTABLE_PIPES:
+            selector.close()
+        if output_fd is not None:
+            os.close(output_fd)
+    
+    if output_prefix is not None:
+        # One summary line in place of the live progress line
+        if last_progress_state is not None:
+            percentage_str, time_str, size_mb, speed, _ = last_progress_state
+            print(f"{output_prefix}{percentage_str}time={time_str} size={size_mb:7.1f}MB speed={speed:5.2f}x", flush=True)
+    elif not faststart_message_shown:
+        # Print newline after progress line
         print()
     
     return process.returncode, "\n".join(error_lines)
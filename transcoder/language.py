@@ -16,19 +16,127 @@ You should have received a copy of the GNU General Public License
 along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
 
+from functools import lru_cache
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
     from babelfish import Language as BabelLanguage
+    from babelfish import language_converters
 else:
     try:
         from babelfish import Language as BabelLanguage
+        from babelfish import language_converters
     except ImportError:
         BabelLanguage = None
+        language_converters = None
 
 from transcoder.constants import DEFAULT_EASYOCR_LANGUAGE
 
+# ISO 639-2 bibliographic to terminological mapping
+_BIBLIOGRAPHIC_TO_TERMINOLOGICAL = {
+    "fre": "fra",  # French bibliographic -> terminological
+    "chi": "zho",  # Chinese bibliographic -> terminological
+    "cze": "ces",  # Czech bibliographic -> terminological
+    "dut": "nld",  # Dutch bibliographic -> terminological
+    "ger": "deu",  # German bibliographic -> terminological
+    "gre": "ell",  # Greek bibliographic -> terminological
+    "ice": "isl",  # Icelandic bibliographic -> terminological
+    "mac": "mkd",  # Macedonian bibliographic -> terminological
+    "rum": "ron",  # Romanian bibliographic -> terminological
+    "slo": "slk",  # Slovak bibliographic -> terminological
+}
 
+# Map EasyOCR codes to ISO 639-2
+_EASYOCR_TO_ISO6392 = {
+    "en": "eng",
+    "fr": "fra",
+    "es": "spa",
+    "de": "deu",
+    "it": "ita",
+    "ja": "jpn",
+    "ko": "kor",
+    "pt": "por",
+    "ru": "rus",
+    "ch_sim": "zho",
+    "ch_tra": "zho",
+}
+
+# Map common 3-letter codes to EasyOCR language codes
+# Note: EasyOCR uses specific codes, not always ISO 639-1
+_EASYOCR_LANGUAGE_MAP = {
+    "fre": "fr",  # French
+    "fra": "fr",
+    "chi": "ch_sim",  # Chinese (Simplified) - EasyOCR uses ch_sim/ch_tra
+    "zho": "ch_sim",
+    "eng": "en",
+    "spa": "es",
+    "deu": "de",
+    "ger": "de",
+    "ita": "it",
+    "jpn": "ja",
+    "kor": "ko",
+    "por": "pt",
+    "rus": "ru",
+}
+
+# Fallback ISO 639-2 -> ISO 639-1 mapping for common codes (used without babelfish)
+_ISO6392_TO_ISO6391_FALLBACK = {
+    "eng": "en",
+    "fra": "fr",
+    "fre": "fr",  # bibliographic variant
+    "spa": "es",
+    "deu": "de",
+    "ger": "de",  # bibliographic variant
+    "ita": "it",
+    "jpn": "ja",
+    "kor": "ko",
+    "por": "pt",
+    "rus": "ru",
+    "zho": "zh",
+    "chi": "zh",  # bibliographic variant
+    "ces": "cs",
+    "cze": "cs",  # bibliographic variant
+    "nld": "nl",
+    "dut": "nl",  # bibliographic variant
+    "ell": "el",
+    "gre": "el",  # bibliographic variant
+    "isl": "is",
+    "ice": "is",  # bibliographic variant
+    "mkd": "mk",
+    "mac": "mk",  # bibliographic variant
+    "ron": "ro",
+    "rum": "ro",  # bibliographic variant
+    "slk": "sk",
+    "slo": "sk",  # bibliographic variant
+}
+
+
+def _build_iso6392_to_iso6391() -> dict[str, str]:
+    """
+    Build the full ISO 639-2 to ISO 639-1 table once.
+    
+    Returns:
+        Mapping of 3-letter codes to 2-letter codes, babelfish entries taking precedence
+    """
+    mapping = dict(_ISO6392_TO_ISO6391_FALLBACK)
+    if language_converters is None:
+        return mapping
+    try:
+        for alpha2 in language_converters["alpha2"].codes:
+            mapping[BabelLanguage.fromcode(alpha2, "alpha2").alpha3] = alpha2.lower()
+    except Exception:
+        # Unexpected babelfish data; keep whatever was resolved
+        pass
+    return mapping
+
+
+_ISO6392_TO_ISO6391 = _build_iso6392_to_iso6391()
+
+# The functions below are pure mappings over a small set of codes, so results
+# are memoized to avoid repeated babelfish lookups
+
+
+@lru_cache(maxsize=None)
 def normalize_language_tag(code: str | None) -> str | None:
     """
     Normalize language tag to ISO 639-2.
@@ -44,30 +152,16 @@ def normalize_language_tag(code: str | None) -> str | None:
 
     code_lower = code.lower().strip()
     
-    # ISO 639-2 bibliographic to terminological mapping
-    iso6392_map = {
-        "fre": "fra",  # French bibliographic -> terminological
-        "chi": "zho",  # Chinese bibliographic -> terminological
-        "cze": "ces",  # Czech bibliographic -> terminological
-        "dut": "nld",  # Dutch bibliographic -> terminological
-        "ger": "deu",  # German bibliographic -> terminological
-        "gre": "ell",  # Greek bibliographic -> terminological
-        "ice": "isl",  # Icelandic bibliographic -> terminological
-        "mac": "mkd",  # Macedonian bibliographic -> terminological
-        "rum": "ron",  # Romanian bibliographic -> terminological
-        "slo": "slk",  # Slovak bibliographic -> terminological
-    }
-    
     # Check if it's a known variation
-    if code_lower in iso6392_map:
-        return iso6392_map[code_lower]
+    if code_lower in _BIBLIOGRAPHIC_TO_TERMINOLOGICAL:
+        return _BIBLIOGRAPHIC_TO_TERMINOLOGICAL[code_lower]
     
     # If already 3-letter, validate with babelfish if available
     if len(code_lower) == 3 and code_lower.isalpha():
         if BabelLanguage:
             try:
                 lang = BabelLanguage(code_lower)
-                iso6392 = getattr(lang, 'alpha3', None)
+                iso6392 = lang.alpha3
                 if iso6392 and len(iso6392) == 3:
                     return iso6392.lower()
                 # If babelfish recognizes it but no alpha3, use the code as-is
@@ -77,31 +171,21 @@ def normalize_language_tag(code: str | None) -> str | None:
                 return code_lower
         return code_lower
 
-    # Try to resolve 2-letter codes using babelfish
-    if len(code_lower) == 2 and code_lower.isalpha():
-        if BabelLanguage:
-            try:
-                lang = BabelLanguage.fromietf(code_lower)
-                iso6392 = getattr(lang, 'alpha3', None)
-                if iso6392 and len(iso6392) == 3:
-                    return iso6392.lower()
-            except Exception:
-                pass
-    
-    # Try to resolve using babelfish directly
+    # Resolve 2-letter codes and IETF tags (e.g. "pt-BR") using babelfish; 3-letter
+    # codes were handled above, so the plain constructor can't succeed here
     if BabelLanguage:
-        for resolver in (BabelLanguage.fromietf, BabelLanguage):
-            try:
-                lang = resolver(code)
-                iso6392 = getattr(lang, 'alpha3', None)
-                if iso6392 and len(iso6392) == 3:
-                    return iso6392.lower()
-            except Exception:
-                continue
+        try:
+            lang = BabelLanguage.fromietf(code_lower if len(code_lower) == 2 else code)
+            iso6392 = lang.alpha3
+            if iso6392 and len(iso6392) == 3:
+                return iso6392.lower()
+        except Exception:
+            pass
     
     return None
 
 
+@lru_cache(maxsize=None)
 def easyocr_to_iso6392(easyocr_code: str) -> str | None:
     """
     Convert EasyOCR language code back to ISO 639-2.
@@ -115,24 +199,10 @@ def easyocr_to_iso6392(easyocr_code: str) -> str | None:
     if not easyocr_code:
         return None
     
-    # Map EasyOCR codes to ISO 639-2
-    easyocr_to_iso6392_map = {
-        "en": "eng",
-        "fr": "fra",
-        "es": "spa",
-        "de": "deu",
-        "it": "ita",
-        "ja": "jpn",
-        "ko": "kor",
-        "pt": "por",
-        "ru": "rus",
-        "ch_sim": "zho",
-        "ch_tra": "zho",
-    }
-    
-    return easyocr_to_iso6392_map.get(easyocr_code.lower())
+    return _EASYOCR_TO_ISO6392.get(easyocr_code.lower())
 
 
+@lru_cache(maxsize=None)
 def iso6392_to_iso6391(iso6392_code: str | None) -> str | None:
     """
     Convert ISO 639-2 code to ISO 639-1 (2-letter) code.
@@ -149,50 +219,10 @@ def iso6392_to_iso6391(iso6392_code: str | None) -> str | None:
     
     iso6392_lower = iso6392_code.lower().strip()
     
-    # Try using babelfish to convert
-    if BabelLanguage:
-        try:
-            lang = BabelLanguage(iso6392_lower)
-            alpha2 = getattr(lang, 'alpha2', None)
-            if alpha2:
-                return alpha2.lower()
-        except Exception:
-            pass
-    
-    # Fallback mapping for common codes
-    iso6392_to_iso6391_map = {
-        "eng": "en",
-        "fra": "fr",
-        "fre": "fr",  # bibliographic variant
-        "spa": "es",
-        "deu": "de",
-        "ger": "de",  # bibliographic variant
-        "ita": "it",
-        "jpn": "ja",
-        "kor": "ko",
-        "por": "pt",
-        "rus": "ru",
-        "zho": "zh",
-        "chi": "zh",  # bibliographic variant
-        "ces": "cs",
-        "cze": "cs",  # bibliographic variant
-        "nld": "nl",
-        "dut": "nl",  # bibliographic variant
-        "ell": "el",
-        "gre": "el",  # bibliographic variant
-        "isl": "is",
-        "ice": "is",  # bibliographic variant
-        "mkd": "mk",
-        "mac": "mk",  # bibliographic variant
-        "ron": "ro",
-        "rum": "ro",  # bibliographic variant
-        "slk": "sk",
-        "slo": "sk",  # bibliographic variant
-    }
-    
-    return iso6392_to_iso6391_map.get(iso6392_lower)
+    return _ISO6392_TO_ISO6391.get(iso6392_lower)
 
 
+@lru_cache(maxsize=None)
 def normalize_language_for_easyocr(language_code: str | None) -> str | None:
     """
     Convert language code to EasyOCR format (ISO 639-1).
@@ -209,36 +239,19 @@ def normalize_language_for_easyocr(language_code: str | None) -> str | None:
     # Handle common language code variations
     language_code = language_code.lower().strip()
     
-    # Map common 3-letter codes to EasyOCR language codes
-    # Note: EasyOCR uses specific codes, not always ISO 639-1
-    lang_map = {
-        "fre": "fr",  # French
-        "fra": "fr",
-        "chi": "ch_sim",  # Chinese (Simplified) - EasyOCR uses ch_sim/ch_tra
-        "zho": "ch_sim",
-        "eng": "en",
-        "spa": "es",
-        "deu": "de",
-        "ger": "de",
-        "ita": "it",
-        "jpn": "ja",
-        "kor": "ko",
-        "por": "pt",
-        "rus": "ru",
-    }
-    
-    if language_code in lang_map:
-        return lang_map[language_code]
+    if language_code in _EASYOCR_LANGUAGE_MAP:
+        return _EASYOCR_LANGUAGE_MAP[language_code]
 
     if BabelLanguage:
-        for resolver in (BabelLanguage.fromietf, BabelLanguage):
-            try:
-                lang = resolver(language_code)
-                alpha2 = getattr(lang, "alpha2", None)
-                if alpha2:
-                    return alpha2.lower()
-            except Exception:
-                continue
+        # 3-letter codes go straight to the constructor, anything else is an IETF tag
+        resolver = BabelLanguage if len(language_code) == 3 else BabelLanguage.fromietf
+        try:
+            lang = resolver(language_code)
+            alpha2 = lang.alpha2
+            if alpha2:
+                return alpha2.lower()
+        except Exception:
+            pass
 
     # If already 2-letter, return as-is
     if len(language_code) == 2 and language_code.isalpha():
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from functools import cache
 from importlib import metadata
 
 PACKAGE_NAME = "transcoder"
@@ -23,6 +24,7 @@ THIRD_PARTY_LIBRARIES = [
 ]
 
 
+@cache
 def get_version() -> str:
     """Return the installed package version using importlib metadata."""
     try:
@@ -33,6 +35,7 @@ def get_version() -> str:
         return __version__
 
 
+@cache
 def format_about_text() -> str:
     """Return a human-readable about/attribution message."""
     version = get_version()
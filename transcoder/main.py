@@ -18,31 +18,39 @@ along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 import argparse
 import os
-import shlex
+import re
 import sys
-import traceback
 from pathlib import Path
 
-from transcoder import license as license_info
-from transcoder.constants import DEFAULT_EASYOCR_LANGUAGE, DEFAULT_TARGET_SIZE_MB_PER_HOUR
+from transcoder.constants import (
+    DEFAULT_EASYOCR_LANGUAGE,
+    DEFAULT_JOBS,
+    DEFAULT_TARGET_SIZE_MB_PER_HOUR,
+    DIAGNOSTICS_SMOKE_TEST_ENV,
+)
 from transcoder.exceptions import TranscoderError
 from transcoder.metadata import DEFAULT_FILENAME_PATTERN
-from transcoder.transcode import dry_run_all, dry_run_analyze, transcode_all, transcode_file
-from transcoder.utils import check_ffmpeg_available, expand_path_pattern
+
+_IS_WIN32 = sys.platform == "win32"
+_FROZEN = bool(getattr(sys, "frozen", False))  # PyInstaller build
+
+# Quotes and whitespace that shells (notably PowerShell) can leave around path arguments
+_QUOTE_CHARS = "\"'"
+_PATH_STRIP_CHARS = " \t\r\n" + _QUOTE_CHARS
+# One segment of an embedded argument tail: whitespace, a quoted run (closing quote
+# optional at the end), or unquoted text
+_TAIL_SEGMENT_PATTERN = re.compile(r"""(\s+)|"([^"]*)"?|'([^']*)'?|([^\s"']+)""")
 
 
 def configure_console_output() -> None:
     """Configure stdout/stderr for better streaming output in packaged builds."""
-    try:
-        if not bool(getattr(sys, "frozen", False)):
-            return
-    except Exception:
+    if not _FROZEN:
         return
 
     # In frozen Windows executables, stdout/stderr can be heavily buffered even when
     # invoked from an interactive terminal. Force line-buffering/write-through when possible.
-    for stream_name in ("stdout", "stderr"):
-        stream = getattr(sys, stream_name, None)
+    for stream in (sys.stdout, sys.stderr):
+        # None in windowed builds without a console
         if stream is None:
             continue
         try:
@@ -60,9 +68,8 @@ def run_diagnostics() -> None:
     print(f"python_version: {sys.version.replace(os.linesep, ' ')}")
     print(f"sys.executable: {sys.executable}")
 
-    frozen = bool(getattr(sys, "frozen", False))
-    print(f"frozen: {frozen}")
-    if frozen:
+    print(f"frozen: {_FROZEN}")
+    if _FROZEN:
         print(f"sys._MEIPASS: {getattr(sys, '_MEIPASS', None)}")
 
     print(f"cwd: {Path.cwd()}")
@@ -77,6 +84,8 @@ def run_diagnostics() -> None:
         print("  ... (truncated)")
 
     print("\n--- torch ---")
+    print(f"CUDA_MODULE_LOADING: {os.environ.get('CUDA_MODULE_LOADING')}")
+    cuda_available = False  # Reused for the EasyOCR check below
     try:
         import torch  # type: ignore
 
@@ -108,28 +117,27 @@ def run_diagnostics() -> None:
         print(f"easyocr.__version__: {getattr(easyocr, '__version__', None)}")
         # Avoid downloading models; just instantiate a Reader with minimal verbosity.
         # This may still fail in broken CUDA/DLL environments, which is exactly what we want to surface.
-        try:
-            import torch  # type: ignore
-
-            use_gpu = bool(getattr(torch, "cuda", None) and torch.cuda.is_available())
-        except Exception:
-            use_gpu = False
+        use_gpu = cuda_available
 
         try:
             reader = easyocr.Reader([DEFAULT_EASYOCR_LANGUAGE], gpu=use_gpu, verbose=False)
             # Access a trivial attribute to ensure initialization completed.
             _ = getattr(reader, "lang_list", None)
             print(f"easyocr.Reader.init_ok: True (gpu={use_gpu})")
-            # Try a minimal OCR call to catch runtime-only failures that occur after init.
-            try:
-                import numpy as np  # type: ignore
-
-                test_img = np.zeros((32, 256, 3), dtype=np.uint8)
-                _ = reader.readtext(test_img)
-                print("easyocr.Reader.readtext_smoke_ok: True")
-            except Exception as e:
-                print("easyocr.Reader.readtext_smoke_ok: False")
-                print(f"easyocr.Reader.readtext_smoke_error: {e}")
+            # A full OCR pass spins up the whole detection/recognition pipeline, so
+            # only run it on request to catch runtime-only failures after init.
+            if os.environ.get(DIAGNOSTICS_SMOKE_TEST_ENV) == "1":
+                try:
+                    import numpy as np  # type: ignore
+
+                    test_img = np.zeros((32, 256, 3), dtype=np.uint8)
+                    _ = reader.readtext(test_img)
+                    print("easyocr.Reader.readtext_smoke_ok: True")
+                except Exception as e:
+                    print("easyocr.Reader.readtext_smoke_ok: False")
+                    print(f"easyocr.Reader.readtext_smoke_error: {e}")
+            else:
+                print(f"easyocr.Reader.readtext_smoke: skipped (set {DIAGNOSTICS_SMOKE_TEST_ENV}=1 to run)")
         except Exception as e:
             print(f"easyocr.Reader.init_ok: False (gpu={use_gpu})")
             print(f"easyocr.Reader.init_error: {e}")
@@ -139,16 +147,105 @@ def run_diagnostics() -> None:
     print("=== end diagnostics ===")
 
 
-def _parse_arguments_powershell() -> list[str]:
+_MEDIA_TYPE_CHOICES = ("show", "movie")
+
+
+def _positive_int(value: str) -> int:
+    """Argument type for counts that must be at least 1."""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return number
+
+
+def _media_type_choice(value: str) -> str:
+    """Fast-path converter for --type; rejects values the full parser's choices would reject."""
+    if value not in _MEDIA_TYPE_CHOICES:
+        raise ValueError(f"invalid choice: {value!r}")
+    return value
+
+
+# Options understood by the fast path: option -> (destination, value converter or None for flags)
+_FAST_PATH_OPTIONS = {
+    "--about": ("about", None),
+    "--diagnose": ("diagnose", None),
+    "--rewrap": ("rewrap", None),
+    "--transcode": ("transcode", None),
+    "--overwrite": ("overwrite", None),
+    "--noBitmapSubs": ("noBitmapSubs", None),
+    "--dry-run": ("dry_run", None),
+    "--targetSizePerHour": ("targetSizePerHour", float),
+    "--targetDir": ("targetDir", str),
+    "--fileNamePattern": ("fileNamePattern", str),
+    "--type": ("type", _media_type_choice),
+    "--jobs": ("jobs", _positive_int),
+}
+
+
+def _fast_parse(argv: list[str]) -> argparse.Namespace | None:
+    """
+    Parse common command lines in a single pass without building the ArgumentParser.
+    
+    Args:
+        argv: Command line arguments without the program name
+    
+    Returns:
+        Parsed arguments matching what the full parser produces, or None when the
+        full parser is needed (help, unknown or abbreviated
+        options, --opt=value forms, or anything the full parser would reject)
+    """
+    values = {
+        "about": False,
+        "rewrap": None,
+        "transcode": False,
+        "diagnose": False,
+        "targetSizePerHour": DEFAULT_TARGET_SIZE_MB_PER_HOUR,
+        "fileNamePattern": DEFAULT_FILENAME_PATTERN,
+        "noBitmapSubs": False,
+        "source": None,
+        "targetDir": None,
+        "type": None,
+        "overwrite": False,
+        "dry_run": False,
+        "jobs": DEFAULT_JOBS,
+    }
+    tokens = iter(argv)
+    for token in tokens:
+        if not token.startswith("-"):
+            if values["source"] is not None:
+                return None
+            values["source"] = token
+            continue
+        
+        option = _FAST_PATH_OPTIONS.get(token)
+        if option is None:
+            return None
+        dest, convert = option
+        if convert is None:
+            values[dest] = True
+            continue
+        
+        value = next(tokens, None)
+        if value is None or value.startswith("-"):
+            return None
+        try:
+            values[dest] = convert(value)
+        except (ValueError, argparse.ArgumentTypeError):
+            return None
+    
+    return argparse.Namespace(**values)
+
+
+def _parse_arguments_powershell(argv: list[str]) -> list[str]:
     """Fallback argument parsing for PowerShell-specific issues."""
-    fixed_argv = [sys.argv[0]]
+    fixed_argv = [argv[0]]
     i = 1
 
-    while i < len(sys.argv):
-        arg = sys.argv[i]
+    while i < len(argv):
+        arg = argv[i]
 
-        if arg.startswith("--") and i + 1 < len(sys.argv):
-            value = sys.argv[i + 1]
+        if arg.startswith("--") and i + 1 < len(argv):
+            value = argv[i + 1]
 
             split_result = _split_embedded_tail(value)
 
@@ -185,34 +282,33 @@ def _parse_arguments_powershell() -> list[str]:
     return fixed_argv
 
 
+def _clean_path_argument(value: str) -> str:
+    """Strip quotes, whitespace and trailing backslashes that PowerShell might add to a path."""
+    return value.strip(_PATH_STRIP_CHARS).rstrip('\\')
+
+
 def _clean_token(value: str) -> str:
     cleaned = value.strip()
-    while len(cleaned) >= 2 and cleaned[0] == cleaned[-1] and cleaned[0] in ("'", '"'):
+    while len(cleaned) >= 2 and cleaned[0] == cleaned[-1] and cleaned[0] in _QUOTE_CHARS:
         cleaned = cleaned[1:-1]
-    cleaned = cleaned.strip('"').strip("'")
-    return cleaned
+    # Drop stray unmatched quotes (e.g. the trailing one PowerShell leaves after "C:\Dir\")
+    return cleaned.strip(_QUOTE_CHARS)
 
 
-def _tokenize_tail(tail: str) -> list[str]:
+def _tokenize_tail(tail: str, start: int = 0) -> list[str]:
     tokens: list[str] = []
     current: list[str] = []
-    quote: str | None = None
 
-    for char in tail:
-        if quote:
-            if char == quote:
-                quote = None
-            else:
-                current.append(char)
+    # Quotes group text (and may sit mid-token); backslashes stay literal for Windows paths
+    for space, double_quoted, single_quoted, bare in _TAIL_SEGMENT_PATTERN.findall(tail, start):
+        if space:
+            if current:
+                tokens.append("".join(current))
+                current = []
         else:
-            if char in ("'", '"'):
-                quote = char
-            elif char.isspace():
-                if current:
-                    tokens.append("".join(current))
-                    current = []
-            else:
-                current.append(char)
+            segment = double_quoted or single_quoted or bare
+            if segment:
+                current.append(segment)
 
     if current:
         tokens.append("".join(current))
@@ -225,39 +321,47 @@ def _split_embedded_tail(token: str) -> tuple[str, list[str]] | None:
     if idx == -1:
         return None
 
-    tail = token[idx + 1 :].lstrip()
-    if not tail.startswith("--"):
-        return None
-
+    # The tail starts right after the space, already at "--"; tokenize it in place
     prefix = token[:idx]
-    extra_tokens = _tokenize_tail(tail)
+    extra_tokens = _tokenize_tail(token, idx + 1)
     return prefix, extra_tokens
 
 
-def parse_arguments() -> argparse.Namespace:
-    """Parse command line arguments, with special handling for PowerShell quoting issues."""
-    original_argv = sys.argv
+def _maybe_fix_powershell_argv(argv: list[str]) -> list[str]:
+    """Repair argv when PowerShell quoting merged option values (Windows only)."""
+    # On Unix-like systems, sys.argv is already properly parsed
+    if not _IS_WIN32:
+        return argv
     
-    # On Unix-like systems, sys.argv is usually already properly parsed
-    # On Windows/PowerShell, we may need custom handling for quote issues
-    # Try using shlex to clean up any malformed arguments first
-    if sys.platform != 'win32':
-        # On Unix-like systems, arguments are usually fine, but clean up if needed
-        # Most of the time, sys.argv is already correct, so we can use it directly
-        pass
-    else:
-        # On Windows, check if we need custom PowerShell handling
-        # Look for signs of PowerShell quote issues (embedded -- in values)
-        needs_custom_parsing = any(
-            ' --' in arg for arg in sys.argv[1:] if not arg.startswith('--')
-        )
-        if needs_custom_parsing:
-            fixed_argv = _parse_arguments_powershell()
-            sys.argv = fixed_argv
-    parser = argparse.ArgumentParser(
-        description="Convert video files to Apple TV compatible MP4 files",
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog="""
+    # Look for signs of PowerShell quote issues (embedded -- in values)
+    for arg in argv[1:]:
+        if not arg.startswith('--') and ' --' in arg:
+            return _parse_arguments_powershell(argv)
+    return argv
+
+
+def parse_arguments(argv: list[str] | None = None) -> argparse.Namespace:
+    """Parse command line arguments, with special handling for PowerShell quoting issues.
+    
+    Args:
+        argv: Full argument vector including the program name (default: sys.argv)
+        
+    Returns:
+        Parsed arguments namespace
+    """
+    if argv is None:
+        argv = sys.argv
+    argv = _maybe_fix_powershell_argv(argv)
+    
+    # Plain invocations are handled without building the full parser
+    args = _fast_parse(argv[1:])
+    if args is not None:
+        return args
+    return _get_parser().parse_args(argv[1:])
+
+
+# Usage examples shown after the option list in --help
+_EPILOG = """
 Examples:
   # Transcode all video files in current directory (default: 900MB/hour target size)
   transcode
@@ -309,6 +413,24 @@ Default behavior:
   - Preserves all text-based subtitle tracks
   - Outputs .mp4 files in the same directory as input files
         """
+
+_PARSER: argparse.ArgumentParser | None = None  # Built on first use by _get_parser
+
+
+def _get_parser() -> argparse.ArgumentParser:
+    """Return the full command line parser, building it on first use."""
+    global _PARSER
+    if _PARSER is None:
+        _PARSER = _build_parser()
+    return _PARSER
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    """Build the full command line parser (help text, validation and error reporting)."""
+    parser = argparse.ArgumentParser(
+        description="Convert video files to Apple TV compatible MP4 files",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=_EPILOG,
     )
     parser.add_argument(
         "--about",
@@ -335,7 +457,8 @@ Default behavior:
     parser.add_argument(
         "--diagnose",
         action="store_true",
-        help="Print environment diagnostics (torch/easyocr/CUDA details) and exit.",
+        help="Print environment diagnostics (torch/easyocr/CUDA details) and exit. "
+             f"Set {DIAGNOSTICS_SMOKE_TEST_ENV}=1 to also run a test OCR pass.",
     )
     parser.add_argument(
         "--targetSizePerHour",
@@ -383,7 +506,7 @@ Default behavior:
     parser.add_argument(
         "--type",
         type=str,
-        choices=["show", "movie"],
+        choices=_MEDIA_TYPE_CHOICES,
         metavar="TYPE",
         help="Override automatic type detection. Use 'show' to force TV show detection or "
              "'movie' to force movie detection. If not specified, type is auto-detected from filename.",
@@ -401,19 +524,29 @@ Default behavior:
         help="Analyze files without processing. Shows detected metadata, Apple TV compatibility, "
              "required actions, and output paths. No files will be modified.",
     )
-    
-    try:
-        return parser.parse_args()
-    finally:
-        sys.argv = original_argv
+    parser.add_argument(
+        "--jobs",
+        type=_positive_int,
+        default=DEFAULT_JOBS,
+        metavar="N",
+        help="Number of files to process at the same time. Each job runs its own ffmpeg, "
+             "and hardware encoders may limit concurrent sessions. "
+             f"Default: {DEFAULT_JOBS}",
+    )
+    return parser
 
 
 def main() -> None:
     """Main entry point for transcoding."""
+    # Load CUDA kernels on first use rather than all at once when torch initializes
+    # (EasyOCR brings in torch); must happen before any torch import
+    os.environ.setdefault("CUDA_MODULE_LOADING", "LAZY")
+    
     try:
         args = parse_arguments()
     except ValueError as e:
         print(f"Error during initialization: {e}")
+        import traceback
         traceback.print_exc()
         sys.exit(1)
     except SystemExit as e:
@@ -422,17 +555,28 @@ def main() -> None:
         print(f"Error during initialization: {e}")
         sys.exit(e.code or 1)
 
-    if getattr(args, "about", False):
+    if args.about:
+        from transcoder import license as license_info
         print(license_info.format_about_text())
         return
 
     configure_console_output()
 
-    if getattr(args, "diagnose", False):
+    if args.diagnose:
         run_diagnostics()
         return
 
-    if not check_ffmpeg_available():
+    # Imported here so --help, --about, --diagnose and argument errors don't load
+    # the transcoding stack (ffmpeg, subtitles/OCR)
+    from transcoder.transcode import dry_run_all, dry_run_analyze, transcode_all, transcode_files
+    from transcoder.utils import check_ffmpeg_available, expand_path_pattern
+
+    if args.dry_run:
+        # Dry runs only probe files, so ffmpeg itself isn't required
+        if not check_ffmpeg_available(require_ffmpeg=False):
+            print("Error: ffprobe not found. Please install ffmpeg.")
+            sys.exit(1)
+    elif not check_ffmpeg_available():
         print("Error: ffmpeg or ffprobe not found. Please install ffmpeg.")
         sys.exit(1)
     
@@ -441,7 +585,7 @@ def main() -> None:
     # DEFAULT_TARGET_SIZE_MB_PER_HOUR is the default, so if it's different, it was provided.
     explicit_transcode_params = (
         args.targetSizePerHour != DEFAULT_TARGET_SIZE_MB_PER_HOUR
-        or getattr(args, "transcode", False)
+        or args.transcode
     )
     
     # Set rewrap/transcode mode
@@ -449,14 +593,14 @@ def main() -> None:
     # - If rewrap is None and transcode params are provided, force transcode.
     # - Otherwise keep user choice or auto-detect (None).
     rewrap_mode = args.rewrap
-    if getattr(args, "transcode", False):
+    if args.transcode:
         rewrap_mode = False
     elif rewrap_mode is None and explicit_transcode_params:
         print("Explicit transcode parameters provided. Forcing Transcode mode.")
         rewrap_mode = False
     
     # Check dependencies (only if bitmap subtitle conversion is enabled)
-    if not getattr(args, "noBitmapSubs", False):
+    if not args.noBitmapSubs:
         try:
             from transcoder.dependency_manager import check_dependencies
             all_available, missing = check_dependencies()
@@ -472,62 +616,55 @@ def main() -> None:
     # Determine target directory first (needed for both wildcard and normal processing)
     target_dir = None
     if args.targetDir:
-        # Strip quotes and trailing backslashes that PowerShell might add
-        target_str = args.targetDir.strip().strip('"').strip("'").rstrip('\\')
-        target_dir = Path(target_str).resolve()
-        # Create target directory if it doesn't exist
-        target_dir.mkdir(parents=True, exist_ok=True)
+        target_str = _clean_path_argument(args.targetDir)
+        target_dir = Path(os.path.normpath(os.path.abspath(target_str)))
+        # Create target directory if it doesn't exist (a stat is cheaper than a failing mkdir)
+        if not target_dir.is_dir():
+            target_dir.mkdir(parents=True, exist_ok=True)
+    
+    # Options shared by every per-file and per-batch call below
+    common_kwargs = dict(
+        rewrap=rewrap_mode,
+        target_size_mb_per_hour=args.targetSizePerHour,
+        filename_pattern=args.fileNamePattern,
+        convert_bitmap_subs=not args.noBitmapSubs,
+        target_dir=target_dir,
+        media_type_override=args.type,
+    )
+    transcode_kwargs = {**common_kwargs, "overwrite": args.overwrite}
     
     # Determine source path (now a positional argument)
     if args.source:
-        # Strip quotes and trailing backslashes that PowerShell might add
-        source_str = args.source.strip().strip('"').strip("'").rstrip('\\')
+        source_str = _clean_path_argument(args.source)
         
         # Check if path contains wildcards
         if '*' in source_str or '?' in source_str:
             try:
                 # Expand glob pattern using utility function
                 video_files = expand_path_pattern(source_str)
+                total = len(video_files)
                 
                 # Check if dry-run mode
-                if getattr(args, "dry_run", False):
-                    print(f"[DRY RUN] Found {len(video_files)} video file(s) matching pattern: {source_str}\n")
+                if args.dry_run:
+                    print(f"[DRY RUN] Found {total} video file(s) matching pattern: {source_str}\n")
                     for video_file in video_files:
-                        dry_run_analyze(
-                            video_file,
-                            rewrap=rewrap_mode,
-                            target_size_mb_per_hour=args.targetSizePerHour,
-                            filename_pattern=args.fileNamePattern,
-                            convert_bitmap_subs=not args.noBitmapSubs,
-                            target_dir=target_dir,
-                            media_type_override=args.type,
-                        )
+                        dry_run_analyze(video_file, **common_kwargs)
                     return
                 
                 # Process matched files directly
-                print(f"Found {len(video_files)} video file(s) matching pattern: {source_str}\n")
-                success_count = 0
-                for video_file in video_files:
-                    if transcode_file(
-                        video_file,
-                        rewrap=rewrap_mode,
-                        target_size_mb_per_hour=args.targetSizePerHour,
-                        filename_pattern=args.fileNamePattern,
-                        convert_bitmap_subs=not args.noBitmapSubs,
-                        target_dir=target_dir,
-                        media_type_override=args.type,
-                        overwrite=args.overwrite,
-                    ):
-                        success_count += 1
+                print(f"Found {total} video file(s) matching pattern: {source_str}\n")
+                success_count = transcode_files(video_files, args.jobs, **transcode_kwargs)
                 
-                print(f"\nCompleted: {success_count}/{len(video_files)} files processed successfully")
+                print(f"\nCompleted: {success_count}/{total} files processed successfully")
                 return
             except (ValueError, TranscoderError) as e:
                 print(f"Error: {e}")
                 sys.exit(1)
         
         # No wildcards, proceed normally
-        source_path = Path(source_str).resolve()
+        # Absolute and normalized (no "." or ".." segments) without the per-component
+        # symlink lookups of resolve(); outputs of a symlinked source go next to the link
+        source_path = Path(os.path.normpath(os.path.abspath(source_str)))
         if not source_path.exists():
             print(f"Error: Source path does not exist: {source_path}")
             sys.exit(1)
@@ -537,32 +674,16 @@ def main() -> None:
     
     try:
         # Check if dry-run mode
-        if getattr(args, "dry_run", False):
-            dry_run_all(
-                source_path,
-                rewrap=rewrap_mode,
-                target_size_mb_per_hour=args.targetSizePerHour,
-                filename_pattern=args.fileNamePattern,
-                convert_bitmap_subs=not args.noBitmapSubs,
-                target_dir=target_dir,
-                media_type_override=args.type,
-            )
+        if args.dry_run:
+            dry_run_all(source_path, **common_kwargs)
         else:
-            transcode_all(
-                source_path,
-                rewrap=rewrap_mode,
-                target_size_mb_per_hour=args.targetSizePerHour,
-                filename_pattern=args.fileNamePattern,
-                convert_bitmap_subs=not args.noBitmapSubs,
-                target_dir=target_dir,
-                media_type_override=args.type,
-                overwrite=args.overwrite,
-            )
+            transcode_all(source_path, jobs=args.jobs, **transcode_kwargs)
     except TranscoderError as e:
         print(f"Error during transcoding: {e}")
         sys.exit(1)
     except Exception as e:
         print(f"Unexpected error during transcoding: {e}")
+        import traceback
         traceback.print_exc()
         sys.exit(1)
 
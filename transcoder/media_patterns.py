@@ -7,8 +7,9 @@ from __future__ import annotations
 import re
 from dataclasses import dataclass
 from enum import Enum
+from functools import lru_cache
 from pathlib import Path
-from typing import Pattern
+from typing import Callable, Pattern
 
 from transcoder.exceptions import MetadataError
 
@@ -26,9 +27,13 @@ PATTERN_TOKEN_MAP: dict[str, str] = {
     "<Air Date>": r"(?P<air_date>\d{4}-\d{2}-\d{2})",
     "<video specs>": r"(?P<specs>.+?)",
 }
+PATTERN_TOKEN_SPLIT = re.compile(r"(<[^>]*>)")
 
-RELEASE_TOKEN_BOUNDARY = re.compile(r"[ ._\-]+")
-QUALITY_BREAK_WORDS = {
+RELEASE_TOKEN_SEPARATOR_TABLE = str.maketrans("()._-", "     ")
+BRACKET_BLOCK_PATTERN = re.compile(r"\[[^\]]*\]")
+RELEASE_GROUP_SUFFIX_PATTERN = re.compile(r"-[A-Za-z0-9]+$")
+COMPONENT_SEPARATOR_TABLE = str.maketrans("_.", "  ")
+QUALITY_BREAK_WORDS = frozenset({
     "480P",
     "720P",
     "1080P",
@@ -65,18 +70,32 @@ QUALITY_BREAK_WORDS = {
     "H264",
     "X264",
     "AV1",
-}
-QUALITY_NUMBER_PATTERN = re.compile(r"^\d{3,4}P$", re.IGNORECASE)
+})
 EDITION_BLOCK_PATTERN = re.compile(r"{edition-(?P<edition>[^}]+)}", re.IGNORECASE)
-YEAR_SUFFIX_PATTERN = re.compile(r"\((?P<year>\d{4})\)$")
-YEAR_TRAILING_PATTERN = re.compile(r"(?P<year>\d{4})$")
 
 SEASON_EPISODE_PATTERN = re.compile(r"(?i)S(?P<season>\d{1,2})E(?P<episode>\d{2})")
 ALT_SEASON_EPISODE_PATTERN = re.compile(r"(?i)(?P<season>\d{1,2})x(?P<episode>\d{2})")
 DATE_EPISODE_PATTERN = re.compile(r"(?P<air_date>\d{4}-\d{2}-\d{2})")
 COMBINED_EPISODE_PATTERN = re.compile(r"(?<!\d)(?P<combined>\d{3})(?!\d)")
+# Union of the episode patterns above: names without any of these can't be detected as TV
+TV_HINT_PATTERN = re.compile(
+    r"S\d{1,2}E\d{2}|\d{1,2}x\d{2}|(?<!\d)\d{3}(?!\d)|\d{4}-\d{2}-\d{2}",
+    re.IGNORECASE,
+)
 CODEC_PREFIX_PATTERN = re.compile(r"(?i)[XH][\d]{3}", re.IGNORECASE)
 RESOLUTION_PATTERN = re.compile(r"(?i)\d{3,4}P", re.IGNORECASE)
+TV_DASH_TITLE_PATTERN = re.compile(
+    r"^(?P<series>.+?)\s*-\s*S(?P<season>\d{1,2})E(?P<episode>\d{2})\s*-\s*(?P<title>.+)$",
+    re.IGNORECASE,
+)
+MOVIE_PAREN_YEAR_PATTERN = re.compile(
+    r"^(?P<title>.+?)\s*\((?P<year>\d{4})\)(?:[ ._\-]+(?P<rest>.+))?$",
+    re.IGNORECASE,
+)
+MOVIE_DOTTED_YEAR_PATTERN = re.compile(
+    r"^(?P<title>.+)[ ._\-](?P<year>\d{4})(?:[ ._\-]+(?P<rest>.+))?$",
+    re.IGNORECASE,
+)
 
 
 class MediaType(str, Enum):
@@ -118,23 +137,21 @@ class MetadataDetection:
     is_manual: bool
 
 
+# The same manual pattern is used for every file in a batch; failures raise and are not cached
+@lru_cache(maxsize=32)
 def build_pattern_regex(pattern: str) -> Pattern[str]:
     buffer: list[str] = []
-    index = 0
-    while index < len(pattern):
-        char = pattern[index]
-        if char == "<":
-            end_index = pattern.find(">", index)
-            if end_index == -1:
-                raise ValueError(f"Incomplete token in pattern near: {pattern[index:]}")
-            token = pattern[index : end_index + 1]
-            if token not in PATTERN_TOKEN_MAP:
-                raise MetadataError(f"Unsupported token '{token}' in filename pattern.")
-            buffer.append(PATTERN_TOKEN_MAP[token])
-            index = end_index + 1
+    # The capturing split alternates literal runs (even indexes) and <token> blocks (odd indexes)
+    for index, part in enumerate(PATTERN_TOKEN_SPLIT.split(pattern)):
+        if index % 2:
+            if part not in PATTERN_TOKEN_MAP:
+                raise MetadataError(f"Unsupported token '{part}' in filename pattern.")
+            buffer.append(PATTERN_TOKEN_MAP[part])
+        elif "<" in part:
+            # Only the last literal run can hold a "<" that has no closing ">"
+            raise ValueError(f"Incomplete token in pattern near: {part[part.index('<'):]}")
         else:
-            buffer.append(re.escape(char))
-            index += 1
+            buffer.append(re.escape(part))
     try:
         return re.compile("^" + "".join(buffer) + "$", re.IGNORECASE)
     except re.error as error:
@@ -190,80 +207,59 @@ def match_manual_pattern(source: Path, regex: Pattern[str]) -> MetadataDetection
 
 
 def detect_metadata(source: Path, manual_pattern: str | None = None, media_type_override: str | None = None) -> MetadataDetection | None:
+    override_type = None
+    if media_type_override:
+        override_type = MediaType.TV_SHOW if media_type_override == "show" else MediaType.MOVIE
+    
     if manual_pattern:
         custom_regex = build_pattern_regex(manual_pattern)
         manual_detection = match_manual_pattern(source, custom_regex)
         if manual_detection:
             # If type override is specified, enforce it
-            if media_type_override:
-                override_type = MediaType.TV_SHOW if media_type_override == "show" else MediaType.MOVIE
-                if manual_detection.media_type != override_type:
-                    # Force the override type, but keep the metadata
-                    manual_detection.media_type = override_type
-                    # If forcing TV show but we have movie metadata, create fallback episode metadata
-                    if override_type == MediaType.TV_SHOW and isinstance(manual_detection.metadata, MovieMetadata):
-                        manual_detection.metadata = EpisodeMetadata(
-                            series_name=manual_detection.metadata.movie_title,
-                            episode_title=manual_detection.metadata.movie_title,
-                            year=manual_detection.metadata.year,
-                            season_number=None,
-                            episode_number=None,
-                        )
-                    # If forcing movie but we have episode metadata, create fallback movie metadata
-                    elif override_type == MediaType.MOVIE and isinstance(manual_detection.metadata, EpisodeMetadata):
-                        manual_detection.metadata = MovieMetadata(
-                            movie_title=manual_detection.metadata.series_name,
-                            year=manual_detection.metadata.year,
-                        )
+            if override_type and manual_detection.media_type != override_type:
+                # Force the override type, but keep the metadata
+                manual_detection.media_type = override_type
+                # If forcing TV show but we have movie metadata, create fallback episode metadata
+                if override_type == MediaType.TV_SHOW and isinstance(manual_detection.metadata, MovieMetadata):
+                    manual_detection.metadata = EpisodeMetadata(
+                        series_name=manual_detection.metadata.movie_title,
+                        episode_title=manual_detection.metadata.movie_title,
+                        year=manual_detection.metadata.year,
+                        season_number=None,
+                        episode_number=None,
+                    )
+                # If forcing movie but we have episode metadata, create fallback movie metadata
+                elif override_type == MediaType.MOVIE and isinstance(manual_detection.metadata, EpisodeMetadata):
+                    manual_detection.metadata = MovieMetadata(
+                        movie_title=manual_detection.metadata.series_name,
+                        year=manual_detection.metadata.year,
+                    )
             return manual_detection
     
     # If type override is specified, force detection to that type
-    if media_type_override:
-        override_type = MediaType.TV_SHOW if media_type_override == "show" else MediaType.MOVIE
+    if override_type:
+        detection = _auto_detect_as(override_type, source.stem)
+        if detection:
+            return detection
+        # Detection failed, fall back to the cleaned file name as the title
+        fallback_title = _clean_component(source.stem)
         if override_type == MediaType.TV_SHOW:
-            episode_detection = _detect_tv_metadata(source.stem)
-            if episode_detection:
-                return MetadataDetection(
-                    media_type=MediaType.TV_SHOW,
-                    metadata=episode_detection,
-                    pattern_name=episode_detection.pattern_name or "auto-tv",
-                    matched=True,
-                    is_manual=False,
-                )
-            # If TV detection failed but override is show, create fallback
-            fallback_title = _clean_component(source.stem)
-            return MetadataDetection(
-                media_type=MediaType.TV_SHOW,
-                metadata=EpisodeMetadata(
-                    series_name=fallback_title,
-                    episode_title=fallback_title,
-                    year=None,
-                    season_number=None,
-                    episode_number=None,
-                ),
-                pattern_name="override-show",
-                matched=False,
-                is_manual=True,
-            )
-        else:  # override_type == MediaType.MOVIE
-            movie_detection = _detect_movie_metadata(source.stem)
-            if movie_detection:
-                return MetadataDetection(
-                    media_type=MediaType.MOVIE,
-                    metadata=movie_detection,
-                    pattern_name=movie_detection.pattern_name or "auto-movie",
-                    matched=True,
-                    is_manual=False,
-                )
-            # If movie detection failed but override is movie, create fallback
-            fallback_title = _clean_component(source.stem)
-            return MetadataDetection(
-                media_type=MediaType.MOVIE,
-                metadata=MovieMetadata(movie_title=fallback_title, year=None),
-                pattern_name="override-movie",
-                matched=False,
-                is_manual=True,
+            metadata: EpisodeMetadata | MovieMetadata = EpisodeMetadata(
+                series_name=fallback_title,
+                episode_title=fallback_title,
+                year=None,
+                season_number=None,
+                episode_number=None,
             )
+        else:
+            metadata = MovieMetadata(movie_title=fallback_title, year=None)
+        return MetadataDetection(
+            media_type=override_type,
+            metadata=metadata,
+            pattern_name=_OVERRIDE_PATTERN_NAMES[override_type],
+            matched=False,
+            is_manual=True,
+        )
     
     auto_detection = auto_detect_metadata(source)
     return auto_detection
@@ -271,33 +267,34 @@ def detect_metadata(source: Path, manual_pattern: str | None = None, media_type_
 
 def auto_detect_metadata(source: Path) -> MetadataDetection | None:
     normalized_name = source.stem
-    episode_detection = _detect_tv_metadata(normalized_name)
-    if episode_detection:
-        return MetadataDetection(
-            media_type=MediaType.TV_SHOW,
-            metadata=episode_detection,
-            pattern_name=episode_detection.pattern_name or "auto-tv",
-            matched=True,
-            is_manual=False,
-        )
-    movie_detection = _detect_movie_metadata(normalized_name)
-    if movie_detection:
-        return MetadataDetection(
-            media_type=MediaType.MOVIE,
-            metadata=movie_detection,
-            pattern_name=movie_detection.pattern_name or "auto-movie",
-            matched=True,
-            is_manual=False,
-        )
+    # Detectors are tried in table order, so TV patterns win over movie patterns
+    for media_type in _AUTO_DETECTORS:
+        detection = _auto_detect_as(media_type, normalized_name)
+        if detection:
+            return detection
     return None
 
 
-def _detect_tv_metadata(name_without_ext: str) -> EpisodeMetadata | None:
-    dash_pattern = re.compile(
-        r"^(?P<series>.+?)\s*-\s*S(?P<season>\d{1,2})E(?P<episode>\d{2})\s*-\s*(?P<title>.+)$",
-        re.IGNORECASE,
+def _auto_detect_as(media_type: MediaType, name_without_ext: str) -> MetadataDetection | None:
+    detector, default_pattern_name = _AUTO_DETECTORS[media_type]
+    metadata = detector(name_without_ext)
+    if metadata is None:
+        return None
+    return MetadataDetection(
+        media_type=media_type,
+        metadata=metadata,
+        pattern_name=metadata.pattern_name or default_pattern_name,
+        matched=True,
+        is_manual=False,
     )
-    dash_match = dash_pattern.match(name_without_ext)
+
+
+def _detect_tv_metadata(name_without_ext: str) -> EpisodeMetadata | None:
+    # One scan rules out most movie names before trying each episode pattern in turn
+    if not TV_HINT_PATTERN.search(name_without_ext):
+        return None
+    
+    dash_match = TV_DASH_TITLE_PATTERN.match(name_without_ext)
     if dash_match:
         return _build_episode_from_groups(
             dash_match.group("series"),
@@ -333,41 +330,19 @@ def _detect_tv_metadata(name_without_ext: str) -> EpisodeMetadata | None:
 
     combined_match = COMBINED_EPISODE_PATTERN.search(name_without_ext)
     if combined_match:
-        combined_value = combined_match.group("combined")
         match_start = combined_match.start()
         match_end = combined_match.end()
-        
-        # Check if this is a codec indicator (X265, H265, X264, H264, etc.)
-        if match_start > 0:
-            preceding_char = name_without_ext[match_start - 1].upper()
-            if preceding_char in ("X", "H"):
-                # This is likely a codec indicator, skip it
-                combined_match = None
-        
-        # Check if this is part of a resolution (1080P, 2160P, etc.)
-        if combined_match and match_end < len(name_without_ext):
-            following_char = name_without_ext[match_end].upper()
-            if following_char == "P":
-                # This is part of a resolution, skip it
-                combined_match = None
-        
-        # Check if this is a year (1900-2099 range)
-        if combined_match:
-            year_value = int(combined_value)
-            if 1900 <= year_value <= 2099:
-                # This is likely a year, skip it
-                combined_match = None
-        
-        if combined_match:
-            season_value = combined_value[0]
-            episode_value = combined_value[1:]
-            series_part = name_without_ext[: match_start]
-            suffix_part = name_without_ext[match_end :]
+        # Only the first three-digit run is considered. Skip it when it is a codec indicator
+        # (X265, H264) or part of a resolution (720P); three digits can never be a year.
+        preceding_char = name_without_ext[match_start - 1 : match_start].upper()
+        following_char = name_without_ext[match_end : match_end + 1].upper()
+        if preceding_char not in ("X", "H") and following_char != "P":
+            combined_value = combined_match.group("combined")
             return _build_episode_from_parts(
-                series_part,
-                suffix_part,
-                season_value,
-                episode_value,
+                name_without_ext[:match_start],
+                name_without_ext[match_end:],
+                combined_value[0],
+                combined_value[1:],
                 pattern_name="tv_three_digit",
             )
 
@@ -392,11 +367,7 @@ def _detect_tv_metadata(name_without_ext: str) -> EpisodeMetadata | None:
 
 
 def _detect_movie_metadata(name_without_ext: str) -> MovieMetadata | None:
-    paren_pattern = re.compile(
-        r"^(?P<title>.+?)\s*\((?P<year>\d{4})\)(?:[ ._\-]+(?P<rest>.+))?$",
-        re.IGNORECASE,
-    )
-    paren_match = paren_pattern.match(name_without_ext)
+    paren_match = MOVIE_PAREN_YEAR_PATTERN.match(name_without_ext)
     if paren_match:
         return _build_movie_from_groups(
             paren_match.group("title"),
@@ -405,11 +376,7 @@ def _detect_movie_metadata(name_without_ext: str) -> MovieMetadata | None:
             pattern_name="movie_paren_year",
         )
 
-    dotted_pattern = re.compile(
-        r"^(?P<title>.+)[ ._\-](?P<year>\d{4})(?:[ ._\-]+(?P<rest>.+))?$",
-        re.IGNORECASE,
-    )
-    dotted_match = dotted_pattern.match(name_without_ext)
+    dotted_match = MOVIE_DOTTED_YEAR_PATTERN.match(name_without_ext)
     if dotted_match:
         return _build_movie_from_groups(
             dotted_match.group("title"),
@@ -421,6 +388,17 @@ def _detect_movie_metadata(name_without_ext: str) -> MovieMetadata | None:
     return None
 
 
+# Automatic detector and default pattern name per media type, in detection order
+_AUTO_DETECTORS: dict[MediaType, tuple[Callable[[str], EpisodeMetadata | MovieMetadata | None], str]] = {
+    MediaType.TV_SHOW: (_detect_tv_metadata, "auto-tv"),
+    MediaType.MOVIE: (_detect_movie_metadata, "auto-movie"),
+}
+_OVERRIDE_PATTERN_NAMES = {
+    MediaType.TV_SHOW: "override-show",
+    MediaType.MOVIE: "override-movie",
+}
+
+
 def _build_episode_from_groups(
     raw_series: str,
     raw_title: str,
@@ -488,27 +466,29 @@ def _build_movie_from_groups(
 
 
 def _clean_component(value: str) -> str:
-    cleaned = value or ""
-    cleaned = re.sub(r"\[.*?\]", "", cleaned)
-    cleaned = cleaned.replace("_", " ").replace(".", " ")
-    cleaned = re.sub(r"\s+", " ", cleaned)
-    cleaned = cleaned.strip(" -_.")
-    cleaned = re.sub(r"-[A-Za-z0-9]+$", "", cleaned).strip()
-    return cleaned
+    if not value:
+        return ""
+    cleaned = BRACKET_BLOCK_PATTERN.sub("", value.translate(COMPONENT_SEPARATOR_TABLE))
+    # split()/join() collapses whitespace runs the same way \s+ did
+    cleaned = " ".join(cleaned.split()).strip(" -_.")
+    return RELEASE_GROUP_SUFFIX_PATTERN.sub("", cleaned).strip()
 
 
 def _clean_episode_title(value: str) -> str:
     if not value:
         return ""
-    value = value.replace("(", " ").replace(")", " ")
-    value = re.sub(r"\[.*?\]", "", value)
-    tokens = RELEASE_TOKEN_BOUNDARY.split(value)
+    value = BRACKET_BLOCK_PATTERN.sub("", value)
+    # Map parentheses and release separators to spaces; the empty tokens left by runs are skipped below
+    tokens = value.translate(RELEASE_TOKEN_SEPARATOR_TABLE).split(" ")
     kept_tokens: list[str] = []
     for token in tokens:
         if not token:
             continue
         uppercase_token = token.upper()
-        if uppercase_token in QUALITY_BREAK_WORDS or QUALITY_NUMBER_PATTERN.match(token):
+        if uppercase_token in QUALITY_BREAK_WORDS:
+            break
+        # Resolution tokens such as 720p/2160P (same as ^\d{3,4}P$, without a regex call per token)
+        if len(token) in (4, 5) and token[-1] in "pP" and token[:-1].isdecimal():
             break
         kept_tokens.append(token)
     title = " ".join(kept_tokens).strip()
@@ -518,16 +498,14 @@ def _clean_episode_title(value: str) -> str:
 def _split_trailing_year(value: str) -> tuple[str, int | None]:
     if not value:
         return "", None
-    match = YEAR_SUFFIX_PATTERN.search(value.strip())
-    if match:
-        year_value = int(match.group("year"))
-        trimmed = value[: match.start()].strip(" -_.")
-        return trimmed, year_value
-    match = YEAR_TRAILING_PATTERN.search(value.strip())
-    if match:
-        year_value = int(match.group("year"))
-        trimmed = value[: match.start()].strip(" -_.")
-        return trimmed, year_value
+    stripped = value.strip()
+    # "Name (2020)"
+    if stripped[-6:-5] == "(" and stripped[-1:] == ")" and stripped[-5:-1].isdecimal():
+        return stripped[:-6].strip(" -_."), int(stripped[-5:-1])
+    # "Name 2020"
+    year_text = stripped[-4:]
+    if len(year_text) == 4 and year_text.isdecimal():
+        return stripped[:-4].strip(" -_."), int(year_text)
     return value, None
 
 
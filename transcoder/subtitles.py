@@ -16,12 +16,17 @@ You should have received a copy of the GNU General Public License
 along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
 
+import hashlib
 import json
 import shutil
 import subprocess
 import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 import easyocr
 from pgsrip.sup import Sup as SupSubtitle
@@ -29,6 +34,9 @@ from pgsrip.sup import Sup as SupSubtitle
 from transcoder.constants import (
     DEFAULT_EASYOCR_LANGUAGE,
     IMAGE_BASED_SUBTITLE_CODECS,
+    MAX_SUBTITLE_EXTRACT_WORKERS,
+    MIN_OCR_FRAME_CONTRAST,
+    OCR_RECOGNITION_BATCH_SIZE,
 )
 from transcoder.exceptions import SubtitleError
 from transcoder.language import (
@@ -38,6 +46,13 @@ from transcoder.language import (
 )
 from transcoder.utils import get_ffmpeg_path, get_ffprobe_path
 
+if TYPE_CHECKING:
+    import numpy as np
+
+# Files transcoded in parallel share one reader per language and take turns running OCR,
+# so the models are held in (GPU) memory only once
+_OCR_LOCK = threading.Lock()
+
 
 @dataclass
 class SubtitleStreamInfo:
@@ -77,8 +92,6 @@ def probe_subtitle_streams(media: Path) -> list[SubtitleStreamInfo]:
     Returns:
         List of SubtitleStreamInfo objects
     """
-    import json
-    
     ffprobe_path = get_ffprobe_path()
     cmd = [
         ffprobe_path,
@@ -165,16 +178,17 @@ def extract_subtitle_sup(
     return sup_path
 
 
-def extract_sup_frames(sup_path: Path, output_dir: Path) -> list[tuple[Path, float, float]]:
+def extract_sup_frames(sup_path: Path) -> list[tuple["np.ndarray", float, float]]:
     """
     Extract frames from SUP file using pgsrip.
     
+    Frames are returned in memory and never written to disk.
+    
     Args:
         sup_path: Path to SUP file
-        output_dir: Directory to save extracted frames
     
     Returns:
-        List of tuples (frame_path, start_timestamp_seconds, end_timestamp_seconds)
+        List of tuples (3-channel uint8 frame, start_timestamp_seconds, end_timestamp_seconds)
     """
     from pgsrip.api import Pgs
     from pgsrip.options import Options
@@ -186,56 +200,59 @@ def extract_sup_frames(sup_path: Path, output_dir: Path) -> list[tuple[Path, flo
     # Create options for pgsrip
     options = Options()
     
-    # Create Pgs object to parse the SUP file
+    # Create Pgs object to parse the SUP file. pgsrip only writes to temp_folder when
+    # keep_temp_files is set, so the SUP file's own directory (the temp directory of
+    # convert_bitmap_subtitles) is reused instead of creating one per track.
     pgs = Pgs(
         media_path=str(sup_path),
         options=options,
         data_reader=lambda: sup_data,
-        temp_folder=str(output_dir)
+        temp_folder=str(sup_path.parent)
     )
     
-    # Use Pgs as context manager to decode the SUP file
-    # This populates the items list with PgsSubtitleItem objects
     import numpy as np
     
-    # Collect image data and timing inside context manager
+    # Accessing items decodes the SUP file into PgsSubtitleItem objects. Pgs is not used as a
+    # context manager: on exit it deletes temp_folder, which still holds the other tracks.
+    if not pgs.items:
+        raise SubtitleError(f"No PGS items found in SUP file {sup_path.name}")
+    
+    # Collect image data and timing info (don't save files yet)
     items_data = []
-    with pgs as pg:
-        # Check if items exist
-        if not pg.items:
-            raise SubtitleError(f"No PGS items found in SUP file {sup_path.name}")
-        
-        # Collect image data and timing info (don't save files yet)
-        for idx, item in enumerate(pg.items):
-            if item.image:
-                # Get image data
-                img_data = item.image.data
-                
-                # Skip empty images
-                if img_data.size == 0:
-                    continue
-                
-                # Get timestamps
-                start_timestamp = 0.0
-                end_timestamp = 3.0
-                
-                if item.start:
-                    if hasattr(item.start, 'ordinal'):
-                        start_timestamp = item.start.ordinal / 1000.0
-                    elif isinstance(item.start, (int, float)):
-                        start_timestamp = item.start / 90000.0
-                
-                if item.end:
-                    if hasattr(item.end, 'ordinal'):
-                        end_timestamp = item.end.ordinal / 1000.0
-                    elif isinstance(item.end, (int, float)):
-                        end_timestamp = item.end / 90000.0
-                    else:
-                        end_timestamp = start_timestamp + 3.0
+    for idx, item in enumerate(pgs.items):
+        if item.image:
+            # Get image data
+            img_data = item.image.data
+            
+            # Skip empty images
+            if img_data.size == 0:
+                continue
+            
+            # Skip blank images (clear/heartbeat packets): without contrast there is no text to OCR
+            if int(img_data.max()) - int(img_data.min()) < MIN_OCR_FRAME_CONTRAST:
+                continue
+            
+            # Get timestamps
+            start_timestamp = 0.0
+            end_timestamp = 3.0
+            
+            if item.start:
+                if hasattr(item.start, 'ordinal'):
+                    start_timestamp = item.start.ordinal / 1000.0
+                elif isinstance(item.start, (int, float)):
+                    start_timestamp = item.start / 90000.0
+            
+            if item.end:
+                if hasattr(item.end, 'ordinal'):
+                    end_timestamp = item.end.ordinal / 1000.0
+                elif isinstance(item.end, (int, float)):
+                    end_timestamp = item.end / 90000.0
                 else:
                     end_timestamp = start_timestamp + 3.0
-                
-                items_data.append((idx, img_data, start_timestamp, end_timestamp))
+            else:
+                end_timestamp = start_timestamp + 3.0
+            
+            items_data.append((idx, img_data, start_timestamp, end_timestamp))
     
     # Return in-memory frames (avoid OpenCV file IO and color conversion in frozen builds)
     frames_with_timing: list[tuple[np.ndarray, float, float]] = []
@@ -260,12 +277,72 @@ def extract_sup_frames(sup_path: Path, output_dir: Path) -> list[tuple[Path, flo
     if not frames_with_timing:
         raise SubtitleError("No frames extracted from SUP file")
     
-    # Type ignores here because we now return arrays instead of paths (consumed by convert_sup_to_srt_easyocr).
-    return frames_with_timing  # type: ignore[return-value]
+    return frames_with_timing
+
+
+def _create_ocr_reader(easyocr_lang: str) -> "easyocr.Reader":
+    """
+    Create an EasyOCR reader for one language.
+    
+    Loading the detection and recognition models takes seconds, so callers
+    converting several tracks should reuse the reader per language.
+    
+    Args:
+        easyocr_lang: EasyOCR language code (e.g., 'en', 'ch_sim')
+    
+    Returns:
+        EasyOCR reader, on the GPU only when CUDA is usable
+    """
+    # Only enable GPU if CUDA is actually available. Hard-coding gpu=True can
+    # cause failures/crashes on systems without a working CUDA runtime.
+    use_gpu = False
+    try:
+        import torch
+        use_gpu = bool(getattr(torch, "cuda", None) and torch.cuda.is_available())
+    except Exception:
+        use_gpu = False
+    # Packaged builds have shown instability in GPU OCR during real workloads even when
+    # CUDA initialization succeeds. Default to CPU OCR when frozen for robustness.
+    try:
+        import sys
+        if bool(getattr(sys, "frozen", False)):
+            use_gpu = False
+    except Exception:
+        use_gpu = False
+    return easyocr.Reader([easyocr_lang], gpu=use_gpu, verbose=False)
+
+
+@lru_cache(maxsize=None)
+def _get_ocr_reader(easyocr_lang: str) -> "easyocr.Reader":
+    """Return the shared EasyOCR reader for a language; call with _OCR_LOCK held."""
+    return _create_ocr_reader(easyocr_lang)
+
+
+def release_ocr_readers() -> None:
+    """Drop the shared EasyOCR readers so their models and GPU memory can be freed."""
+    with _OCR_LOCK:
+        _get_ocr_reader.cache_clear()
+
+
+def _seconds_to_srt_time(secs: float) -> str:
+    """
+    Format a timestamp as an SRT time (HH:MM:SS,mmm).
+    
+    Args:
+        secs: Timestamp in seconds
+    
+    Returns:
+        SRT formatted timestamp
+    """
+    # Round to whole milliseconds first so e.g. 1.001 (1000.999... ms) is not truncated to 1,000
+    seconds, milliseconds = divmod(round(secs * 1000), 1000)
+    minutes, seconds = divmod(seconds, 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d},{milliseconds:03d}"
 
 
 def convert_sup_to_srt_easyocr(
-    sup_path: Path, language_code: str | None = None
+    sup_path: Path, language_code: str | None = None, reader: "easyocr.Reader | None" = None
 ) -> Path:
     """
     Convert SUP file to SRT using EasyOCR.
@@ -273,6 +350,7 @@ def convert_sup_to_srt_easyocr(
     Args:
         sup_path: Path to SUP file
         language_code: ISO 639-1 language code for EasyOCR (e.g., 'en', 'fr')
+        reader: Optional EasyOCR reader for language_code to reuse; created when omitted
     
     Returns:
         Path to generated SRT file
@@ -280,85 +358,50 @@ def convert_sup_to_srt_easyocr(
     Raises:
         RuntimeError: If OCR fails
     """
-    temp_dir = sup_path.parent / f"{sup_path.stem}_frames"
-    temp_dir.mkdir(parents=True, exist_ok=True)
+    # Extract frames from SUP with timing
+    frames_with_timing = extract_sup_frames(sup_path)
+    if not frames_with_timing:
+        raise SubtitleError(f"No frames extracted from {sup_path.name}")
     
-    try:
-        # Extract frames from SUP with timing
-        frames_with_timing = extract_sup_frames(sup_path, temp_dir)
-        if not frames_with_timing:
-            raise SubtitleError(f"No frames extracted from {sup_path.name}")
-        
-        # Initialize EasyOCR reader.
-        # Only enable GPU if CUDA is actually available. Hard-coding gpu=True can
-        # cause failures/crashes on systems without a working CUDA runtime.
-        easyocr_lang = language_code or DEFAULT_EASYOCR_LANGUAGE
-        use_gpu = False
-        try:
-            import torch
-            use_gpu = bool(getattr(torch, "cuda", None) and torch.cuda.is_available())
-        except Exception:
-            use_gpu = False
-        # Packaged builds have shown instability in GPU OCR during real workloads even when
-        # CUDA initialization succeeds. Default to CPU OCR when frozen for robustness.
-        try:
-            import sys
-            if bool(getattr(sys, "frozen", False)):
-                use_gpu = False
-        except Exception:
-            use_gpu = False
-        reader = easyocr.Reader([easyocr_lang], gpu=use_gpu, verbose=False)
-        
-        # Process frames and collect text with timing
-        subtitle_entries = []
-        
-        def seconds_to_srt_time(secs: float) -> str:
-            hours = int(secs // 3600)
-            minutes = int((secs % 3600) // 60)
-            seconds = int(secs % 60)
-            milliseconds = int((secs % 1) * 1000)
-            return f"{hours:02d}:{minutes:02d}:{seconds:02d},{milliseconds:03d}"
-        
+    # Initialize EasyOCR reader unless the caller shares one
+    if reader is None:
+        reader = _create_ocr_reader(language_code or DEFAULT_EASYOCR_LANGUAGE)
+    
+    # Process frames and write each cue to the SRT file as soon as it is recognized
+    srt_path = sup_path.with_suffix(".srt")
+    entry_count = 0
+    # Streams often repeat the same bitmap (re-announced or repositioned cues); OCR each once
+    text_by_frame: dict[tuple, list[str]] = {}
+    with open(srt_path, "w", encoding="utf-8") as f:
         for img_bgr, start_time, end_time in frames_with_timing:
-            # OCR the in-memory frame
-            results = reader.readtext(img_bgr)
-            
-            if results:
+            frame_key = (img_bgr.shape, hashlib.blake2b(img_bgr.tobytes(), digest_size=16).digest())
+            text_lines = text_by_frame.get(frame_key)
+            if text_lines is None:
+                # OCR the in-memory frame; the text lines found in it are recognized in batches
+                # rather than one recognizer call per line
+                results = reader.readtext(img_bgr, batch_size=OCR_RECOGNITION_BATCH_SIZE)
+                
                 # Combine all detected text from this frame
                 text_lines = [result[1] for result in results if result[2] > 0.5]  # Confidence threshold
-                if text_lines:
-                    text = " ".join(text_lines)
-                    
-                    subtitle_entries.append({
-                        "start": start_time,
-                        "end": end_time,
-                        "text": text,
-                        "start_str": seconds_to_srt_time(start_time),
-                        "end_str": seconds_to_srt_time(end_time),
-                    })
-        
-        # Generate SRT file
-        srt_path = sup_path.with_suffix(".srt")
-        with open(srt_path, "w", encoding="utf-8") as f:
-            for idx, entry in enumerate(subtitle_entries, 1):
-                f.write(f"{idx}\n")
-                f.write(f"{entry['start_str']} --> {entry['end_str']}\n")
-                f.write(f"{entry['text']}\n\n")
-        
-        if not subtitle_entries:
-            raise SubtitleError(f"No text detected in {sup_path.name}")
-        
-        return srt_path
-    
-    finally:
-        # Clean up frames
-        if temp_dir.exists():
-            shutil.rmtree(temp_dir, ignore_errors=True)
+                text_by_frame[frame_key] = text_lines
+            if text_lines:
+                entry_count += 1
+                f.write(
+                    f"{entry_count}\n"
+                    f"{_seconds_to_srt_time(start_time)} --> {_seconds_to_srt_time(end_time)}\n"
+                    f"{' '.join(text_lines)}\n\n"
+                )
+    
+    if not entry_count:
+        raise SubtitleError(f"No text detected in {sup_path.name}")
+    
+    return srt_path
 
 
 def convert_bitmap_subtitles(
     media: Path,
     streams: list[SubtitleStreamInfo],
+    output_prefix: str | None = None,
 ) -> tuple[list[GeneratedSubtitle], Path | None]:
     """
     Convert bitmap subtitle streams to text subtitles using EasyOCR.
@@ -366,6 +409,9 @@ def convert_bitmap_subtitles(
     Args:
         media: Path to media file
         streams: List of bitmap subtitle streams to convert
+        output_prefix: Optional prefix for status lines, e.g. "[Show.mkv] ". When set (several
+            files running at once), each track gets one plain line when done instead of a
+            status line that is updated in place.
     
     Returns:
         Tuple of (list of GeneratedSubtitle, temp directory path)
@@ -378,7 +424,8 @@ def convert_bitmap_subtitles(
     import sys
     import os
     
-    interactive_output = bool(getattr(sys.stdout, "isatty", lambda: False)())
+    # Cursor movement only works while this file owns the console
+    interactive_output = output_prefix is None and bool(getattr(sys.stdout, "isatty", lambda: False)())
 
     # Enable ANSI escape sequences on Windows (only when writing to a real TTY)
     if os.name == 'nt' and interactive_output:
@@ -392,16 +439,17 @@ def convert_bitmap_subtitles(
     # Print all "Converting..." messages upfront, before any processing
     # This ensures they appear immediately without delays
     total_streams = len(streams)
-    for idx, stream in enumerate(streams):
-        lang_display = stream.language or "unknown"
-        sys.stdout.write(f"Converting bitmap subtitle track {idx} ({lang_display}) to text using OCR...\n")
-        sys.stdout.flush()
+    if output_prefix is None:
+        for idx, stream in enumerate(streams):
+            lang_display = stream.language or "unknown"
+            sys.stdout.write(f"Converting bitmap subtitle track {idx} ({lang_display}) to text using OCR...\n")
+            sys.stdout.flush()
     
     # Helper function to update a specific line
     def update_line(line_index: int, message: str):
         """Update a specific line (0-indexed from the first Converting message)."""
         if not interactive_output:
-            print(message, flush=True)
+            print(f"{output_prefix or ''}{message}", flush=True)
             return
         # Calculate how many lines up we need to go
         # After printing all messages, we're at the start of a new line (total_streams lines down)
@@ -418,46 +466,56 @@ def convert_bitmap_subtitles(
     
     # Now process each stream and update the corresponding line with success/failed
     try:
-        for idx, stream in enumerate(streams):
-            lang_display = stream.language or "unknown"
-            
-            # Convert language to EasyOCR format (ISO 639-1)
-            easyocr_lang = normalize_language_for_easyocr(stream.language)
-            
-            if not easyocr_lang:
-                update_line(idx, f"Converting bitmap subtitle track {idx} ({lang_display}) to text using OCR... skipped (unable to determine language)")
-                continue
-            
-            # Ensure we have ISO 639-2 code for metadata (normalize if needed)
-            # stream.language is already normalized by probe_subtitle_streams, but double-check
-            metadata_lang = normalize_language_tag(stream.language)
-            if not metadata_lang:
-                # Fallback: try to convert EasyOCR lang back to ISO 639-2
-                metadata_lang = easyocr_to_iso6392(easyocr_lang)
-            if not metadata_lang:
-                # Last resort: use original code (might not be ISO 639-2)
-                metadata_lang = stream.language
-            
-            try:
-                sup_path = extract_subtitle_sup(media, stream, temp_dir)
-                srt_path = convert_sup_to_srt_easyocr(sup_path, easyocr_lang)
+        # Each extraction is a separate ffmpeg pass over the media file. Start them up front
+        # so they overlap with OCR, which stays sequential on the shared readers.
+        ocr_indexes = [idx for idx, stream in enumerate(streams) if normalize_language_for_easyocr(stream.language)]
+        extract_workers = max(1, min(len(ocr_indexes), MAX_SUBTITLE_EXTRACT_WORKERS))
+        with ThreadPoolExecutor(max_workers=extract_workers) as executor:
+            extractions = {
+                idx: executor.submit(extract_subtitle_sup, media, streams[idx], temp_dir)
+                for idx in ocr_indexes
+            }
+            for idx, stream in enumerate(streams):
+                lang_display = stream.language or "unknown"
+                
+                # Convert language to EasyOCR format (ISO 639-1)
+                easyocr_lang = normalize_language_for_easyocr(stream.language)
+                
+                if not easyocr_lang:
+                    update_line(idx, f"Converting bitmap subtitle track {idx} ({lang_display}) to text using OCR... skipped (unable to determine language)")
+                    continue
                 
-                if sup_path.exists():
-                    sup_path.unlink(missing_ok=True)
+                # Ensure we have ISO 639-2 code for metadata (normalize if needed)
+                # stream.language is already normalized by probe_subtitle_streams, but double-check
+                metadata_lang = normalize_language_tag(stream.language)
+                if not metadata_lang:
+                    # Fallback: try to convert EasyOCR lang back to ISO 639-2
+                    metadata_lang = easyocr_to_iso6392(easyocr_lang)
+                if not metadata_lang:
+                    # Last resort: use original code (might not be ISO 639-2)
+                    metadata_lang = stream.language
                 
-                generated.append(
-                    GeneratedSubtitle(
-                        path=srt_path,
-                        language=metadata_lang,  # ISO 639-2 for metadata
-                        title=stream.title or f"{(metadata_lang or 'und').upper()} OCR",
+                try:
+                    sup_path = extractions[idx].result()
+                    with _OCR_LOCK:
+                        srt_path = convert_sup_to_srt_easyocr(sup_path, easyocr_lang, _get_ocr_reader(easyocr_lang))
+                    
+                    if sup_path.exists():
+                        sup_path.unlink(missing_ok=True)
+                    
+                    generated.append(
+                        GeneratedSubtitle(
+                            path=srt_path,
+                            language=metadata_lang,  # ISO 639-2 for metadata
+                            title=stream.title or f"{(metadata_lang or 'und').upper()} OCR",
+                        )
                     )
-                )
-                # Update the line with success
-                update_line(idx, f"Converting bitmap subtitle track {idx} ({lang_display}) to text using OCR...success")
-            except Exception as e:
-                # Update the line with failure
-                update_line(idx, f"Converting bitmap subtitle track {idx} ({lang_display}) to text using OCR...failed: {e}")
-                continue
+                    # Update the line with success
+                    update_line(idx, f"Converting bitmap subtitle track {idx} ({lang_display}) to text using OCR...success")
+                except Exception as e:
+                    # Update the line with failure
+                    update_line(idx, f"Converting bitmap subtitle track {idx} ({lang_display}) to text using OCR...failed: {e}")
+                    continue
     except Exception:
         shutil.rmtree(temp_dir, ignore_errors=True)
         raise
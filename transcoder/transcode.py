@@ -17,6 +17,8 @@ along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
 
 import shutil
+import textwrap
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 from transcoder.compatibility import (
@@ -25,7 +27,7 @@ from transcoder.compatibility import (
     check_apple_tv_compatibility,
     format_compatibility_report,
 )
-from transcoder.constants import DEFAULT_TARGET_SIZE_MB_PER_HOUR, SUPPORTED_VIDEO_FORMATS
+from transcoder.constants import DEFAULT_JOBS, DEFAULT_TARGET_SIZE_MB_PER_HOUR, SUPPORTED_VIDEO_FORMATS
 from transcoder.ffmpeg import (
     build_rewrap_command,
     build_transcode_command,
@@ -43,6 +45,7 @@ from transcoder.subtitles import (
     SubtitleStreamInfo,
     convert_bitmap_subtitles,
     probe_subtitle_streams,
+    release_ocr_readers,
 )
 from transcoder.utils import (
     calculate_target_bitrate,
@@ -330,6 +333,8 @@ def transcode_file(
     target_dir: Path | None = None,
     media_type_override: str | None = None,
     overwrite: bool = False,
+    output_path: Path | None = None,
+    live_progress: bool = True,
 ) -> bool:
     """
     Transcode a single video file to MP4.
@@ -343,13 +348,20 @@ def transcode_file(
         target_dir: Optional target directory for output. If None, output is in same directory as input.
         media_type_override: Optional type override ("show" or "movie") to force type detection
         overwrite: If True, overwrite existing output files. If False, add incremental suffix to avoid overwriting.
+        output_path: Output path already chosen by the caller; derived from target_dir and overwrite if None.
+        live_progress: If True, show live progress lines. If False (other files are being processed at the
+            same time), print only whole lines labelled with the input file name.
     
     Returns:
         True if successful, False otherwise
     """
-    output_path = get_output_path(input_path, target_dir, overwrite)
+    if output_path is None:
+        output_path = get_output_path(input_path, target_dir, overwrite)
     
-    print(f"Processing: {input_path.name}")
+    output_prefix = None if live_progress else f"[{input_path.name}] "
+    log_prefix = output_prefix or ""
+    
+    print(f"{log_prefix}Processing: {input_path.name}")
     
     temp_dirs = []
     generated_subtitles = []
@@ -364,17 +376,17 @@ def transcode_file(
             if detection.media_type == MediaType.TV_SHOW and isinstance(media_metadata, EpisodeMetadata):
                 episode_label = media_metadata.episode_id or "S??E??"
                 print(
-                    f"Detected TV Show ({detection.pattern_name}): "
+                    f"{log_prefix}Detected TV Show ({detection.pattern_name}): "
                     f"{media_metadata.series_name} - {episode_label} - {media_metadata.episode_title}"
                 )
             elif detection.media_type == MediaType.MOVIE and isinstance(media_metadata, MovieMetadata):
                 year_suffix = f" ({media_metadata.year})" if media_metadata.year else ""
-                print(f"Detected Movie ({detection.pattern_name}): {media_metadata.movie_title}{year_suffix}")
+                print(f"{log_prefix}Detected Movie ({detection.pattern_name}): {media_metadata.movie_title}{year_suffix}")
         if media_metadata is None:
-            print("No typematch for metadata extraction, file name used")
+            print(f"{log_prefix}No typematch for metadata extraction, file name used")
             fallback_title = _format_fallback_title(input_path.stem)
             media_metadata = MovieMetadata(movie_title=fallback_title, year=None)
-            print(f"Detected Movie (fallback): {media_metadata.movie_title}")
+            print(f"{log_prefix}Detected Movie (fallback): {media_metadata.movie_title}")
         
         probe_data = probe_video_file(input_path)
         text_subtitle_streams = get_text_subtitle_streams(probe_data)
@@ -384,10 +396,10 @@ def transcode_file(
         if effective_rewrap is None:
             compat = check_apple_tv_compatibility(probe_data, input_path)
             if compat.overall_status in {CompatibilityStatus.COMPATIBLE, CompatibilityStatus.NEEDS_REWRAP}:
-                print("File is Apple TV compatible. Selecting Rewrap mode for efficiency.")
+                print(f"{log_prefix}File is Apple TV compatible. Selecting Rewrap mode for efficiency.")
                 effective_rewrap = True
             else:
-                print("File is not Apple TV compatible. Selecting Transcode mode.")
+                print(f"{log_prefix}File is not Apple TV compatible. Selecting Transcode mode.")
                 effective_rewrap = False
         
         # Find and convert cover image if available
@@ -400,9 +412,9 @@ def transcode_file(
                 temp_dirs.append(image_temp_dir)
                 
                 cover_image_path = convert_image_for_apple_tv(cover_image, image_temp_dir)
-                print(f"Found cover image: {cover_image.name}")
+                print(f"{log_prefix}Found cover image: {cover_image.name}")
             except Exception as e:
-                print(f"Warning: Could not process cover image: {e}")
+                print(f"{log_prefix}Warning: Could not process cover image: {e}")
                 cover_image_path = None
         
         # Convert bitmap subtitles if requested
@@ -412,25 +424,25 @@ def transcode_file(
                 bitmap_streams = [s for s in subtitle_streams_info if s.is_image_based]
                 
                 if bitmap_streams:
-                    print(f"Found {len(bitmap_streams)} bitmap subtitle track(s), converting to text...")
+                    print(f"{log_prefix}Found {len(bitmap_streams)} bitmap subtitle track(s), converting to text...")
                     generated_subtitles, temp_dir = convert_bitmap_subtitles(
-                        input_path, bitmap_streams
+                        input_path, bitmap_streams, output_prefix
                     )
                     if temp_dir:
                         temp_dirs.append(temp_dir)
                     if generated_subtitles:
-                        print(f"Converted {len(generated_subtitles)} bitmap subtitle(s) to text")
+                        print(f"{log_prefix}Converted {len(generated_subtitles)} bitmap subtitle(s) to text")
             except Exception as e:
-                print(f"Warning: Could not convert bitmap subtitles: {e}")
+                print(f"{log_prefix}Warning: Could not convert bitmap subtitles: {e}")
         
         if effective_rewrap:
             cmd = build_rewrap_command(
                 input_path, output_path, text_subtitle_streams, probe_data,
                 generated_subtitles, media_metadata, cover_image_path
             )
-            print("Mode: Rewrap (stream copy)")
+            print(f"{log_prefix}Mode: Rewrap (stream copy)")
             if cover_image_path:
-                print(f"Embedding cover image: {cover_image_path.name}")
+                print(f"{log_prefix}Embedding cover image: {cover_image_path.name}")
         else:
             duration = get_video_duration(probe_data)
             _, video_bitrate_kbps = calculate_target_bitrate(
@@ -449,18 +461,18 @@ def transcode_file(
                 encoder, generated_subtitles, media_metadata, cover_image_path
             )
             if cover_image_path:
-                print(f"Embedding cover image: {cover_image_path.name}")
-            print(f"Mode: Transcode (target: {target_size_mb_per_hour}MB/hour)")
-            print(f"Encoder: {encoder_name}")
-            print(f"Video bitrate: {int(video_bitrate_kbps)}k")
+                print(f"{log_prefix}Embedding cover image: {cover_image_path.name}")
+            print(f"{log_prefix}Mode: Transcode (target: {target_size_mb_per_hour}MB/hour)")
+            print(f"{log_prefix}Encoder: {encoder_name}")
+            print(f"{log_prefix}Video bitrate: {int(video_bitrate_kbps)}k")
         
         total_subtitles = len(text_subtitle_streams) + len(generated_subtitles)
         if total_subtitles > 0:
-            print(f"Found {len(text_subtitle_streams)} text subtitle track(s) + {len(generated_subtitles)} converted bitmap subtitle(s)")
+            print(f"{log_prefix}Found {len(text_subtitle_streams)} text subtitle track(s) + {len(generated_subtitles)} converted bitmap subtitle(s)")
         else:
-            print("No text subtitles found")
+            print(f"{log_prefix}No text subtitles found")
         
-        print(f"Output: {output_path.name}")
+        print(f"{log_prefix}Output: {output_path.name}")
         
         # Get duration for percentage calculation (works for both transcode and rewrap)
         duration = get_video_duration(probe_data)
@@ -483,18 +495,20 @@ def transcode_file(
             except (ValueError, KeyError):
                 pass
         
-        returncode, error_output = run_ffmpeg_with_progress(cmd, duration, output_path, input_size_bytes, total_frames, source_fps)
+        returncode, error_output = run_ffmpeg_with_progress(
+            cmd, duration, output_path, input_size_bytes, total_frames, source_fps, output_prefix
+        )
         
         if returncode == 0:
-            print(f"[OK] Successfully processed {input_path.name}\n")
+            print(f"{log_prefix}[OK] Successfully processed {input_path.name}\n")
             return True
         else:
-            print(f"[ERROR] Error processing {input_path.name}:")
-            print(error_output)
+            print(f"{log_prefix}[ERROR] Error processing {input_path.name}:")
+            print(textwrap.indent(error_output, log_prefix))
             return False
     
     except Exception as e:
-        print(f"[ERROR] Error processing {input_path.name}: {e}\n")
+        print(f"{log_prefix}[ERROR] Error processing {input_path.name}: {e}\n")
         return False
     finally:
         # Clean up temporary directories
@@ -503,6 +517,57 @@ def transcode_file(
                 shutil.rmtree(temp_dir, ignore_errors=True)
 
 
+def transcode_files(video_files: list[Path], jobs: int = DEFAULT_JOBS, **options) -> int:
+    """
+    Transcode a list of video files, optionally several at a time.
+    
+    Each file is an independent ffmpeg run, so jobs > 1 uses a thread pool: the
+    workers mostly wait on their ffmpeg subprocess, and threads avoid re-importing
+    the OCR stack in every worker process (and the frozen-build spawn quirks).
+    Concurrent files print whole lines labelled with their file name instead of
+    live progress.
+    
+    All output paths are chosen up front, so two sources mapping to the same
+    name (e.g. Show.mkv and Show.avi) never write to the same file, whether
+    they run one after the other or at the same time.
+    
+    Args:
+        video_files: Video files to transcode, in order
+        jobs: Maximum number of files processed at the same time
+        **options: Keyword arguments passed to transcode_file for every file
+        
+    Returns:
+        Number of files processed successfully
+    """
+    reserved: set[Path] = set()
+    output_paths = [
+        get_output_path(video_file, options.get("target_dir"), options.get("overwrite", False), reserved)
+        for video_file in video_files
+    ]
+    
+    try:
+        # transcode_file reports its own failures and returns False, so one bad
+        # file doesn't stop the batch
+        if jobs <= 1 or len(video_files) <= 1:
+            return sum(
+                1 for video_file, output_path in zip(video_files, output_paths)
+                if transcode_file(video_file, output_path=output_path, **options)
+            )
+        
+        with ThreadPoolExecutor(max_workers=min(jobs, len(video_files))) as executor:
+            results = executor.map(
+                lambda video_file, output_path: transcode_file(
+                    video_file, output_path=output_path, live_progress=False, **options
+                ),
+                video_files,
+                output_paths,
+            )
+            return sum(1 for ok in results if ok)
+    finally:
+        # OCR readers are shared by the files of this batch only
+        release_ocr_readers()
+
+
 def transcode_all(
     source_path: Path,
     rewrap: bool | None = None,
@@ -512,6 +577,7 @@ def transcode_all(
     target_dir: Path | None = None,
     media_type_override: str | None = None,
     overwrite: bool = False,
+    jobs: int = DEFAULT_JOBS,
 ) -> None:
     """
     Transcode video files from source path (file or directory).
@@ -525,6 +591,7 @@ def transcode_all(
         target_dir: Optional target directory for output. If None, output is in same directory as input.
         media_type_override: Optional type override ("show" or "movie") to force type detection
         overwrite: If True, overwrite existing output files. If False, add incremental suffix to avoid overwriting.
+        jobs: Maximum number of files processed at the same time
     """
     # Check if source is a file or directory
     if source_path.is_file():
@@ -546,10 +613,17 @@ def transcode_all(
         print(f"Error: {source_path} does not exist or is not a valid file or directory")
         return
     
-    success_count = 0
-    for video_file in video_files:
-        if transcode_file(video_file, rewrap, target_size_mb_per_hour, filename_pattern, convert_bitmap_subs, target_dir, media_type_override, overwrite):
-            success_count += 1
+    success_count = transcode_files(
+        video_files,
+        jobs,
+        rewrap=rewrap,
+        target_size_mb_per_hour=target_size_mb_per_hour,
+        filename_pattern=filename_pattern,
+        convert_bitmap_subs=convert_bitmap_subs,
+        target_dir=target_dir,
+        media_type_override=media_type_override,
+        overwrite=overwrite,
+    )
     
     print(f"\nCompleted: {success_count}/{len(video_files)} files processed successfully")
 
@@ -16,12 +16,14 @@ You should have received a copy of the GNU General Public License
 along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
 
+import fnmatch
 import os
 import shutil
 import subprocess
 import sys
 import tempfile
 from fractions import Fraction
+from functools import lru_cache
 from pathlib import Path
 
 from transcoder.constants import (
@@ -183,10 +185,20 @@ def get_ffprobe_path() -> str:
     raise FFmpegError("ffprobe not found. Please install ffmpeg or use the bundled executable.")
 
 
-def check_ffmpeg_available() -> bool:
-    """Check if ffmpeg and ffprobe are available."""
+@lru_cache(maxsize=None)
+def check_ffmpeg_available(require_ffmpeg: bool = True) -> bool:
+    """
+    Check if ffmpeg and ffprobe are available.
+    
+    Args:
+        require_ffmpeg: Also require ffmpeg; analysis-only runs need just ffprobe
+    
+    Returns:
+        True if the required binaries were found (cached for the process lifetime)
+    """
     try:
-        get_ffmpeg_path()
+        if require_ffmpeg:
+            get_ffmpeg_path()
         get_ffprobe_path()
         return True
     except FFmpegError:
@@ -426,20 +438,35 @@ def expand_path_pattern(pattern: str) -> list[Path]:
         search_dir = Path.cwd() / path.parent
         file_pattern = path.name
     
-    # Expand the glob pattern
-    matching_files = list(search_dir.glob(file_pattern))
-    if not matching_files:
+    # Expand the glob pattern over a single directory listing (fnmatch follows the
+    # platform's case sensitivity, like Path.glob)
+    try:
+        with os.scandir(search_dir) as entries:
+            entry_names = [entry.name for entry in entries]
+    except OSError:
+        entry_names = []
+    matching_names = fnmatch.filter(entry_names, file_pattern)
+    if not matching_names:
         raise ValueError(f"No files found matching pattern: {pattern}")
     
     # Filter to only supported video formats
-    video_files = [Path(f) for f in matching_files if Path(f).suffix.lower() in SUPPORTED_VIDEO_FORMATS]
+    video_files = [
+        search_dir / name
+        for name in matching_names
+        if os.path.splitext(name)[1].lower() in SUPPORTED_VIDEO_FORMATS
+    ]
     if not video_files:
         raise ValueError(f"No supported video files found matching pattern: {pattern}")
     
     return sorted(video_files)
 
 
-def get_output_path(input_path: Path, target_dir: Path | None = None, overwrite: bool = False) -> Path:
+def get_output_path(
+    input_path: Path,
+    target_dir: Path | None = None,
+    overwrite: bool = False,
+    reserved: set[Path] | None = None,
+) -> Path:
     """
     Generate output .mp4 path from input video file path.
     
@@ -447,6 +474,8 @@ def get_output_path(input_path: Path, target_dir: Path | None = None, overwrite:
         input_path: Path to input video file
         target_dir: Optional target directory for output. If None, output is in same directory as input.
         overwrite: If True, allow overwriting existing files. If False, add incremental suffix to avoid overwriting.
+        reserved: Optional output paths already claimed by other files of the same batch. They are
+            never returned, even with overwrite, and the returned path is added to the set.
     
     Returns:
         Path to output .mp4 file
@@ -459,26 +488,27 @@ def get_output_path(input_path: Path, target_dir: Path | None = None, overwrite:
     else:
         base_path = input_path.with_suffix(".mp4")
     
-    # If overwrite is enabled, return the path as-is
-    if overwrite:
-        return base_path
-    
-    # If file doesn't exist, return the path as-is
-    if not base_path.exists():
-        return base_path
-    
-    # File exists, need to find a non-existing name by incrementing suffix
-    stem = base_path.stem
-    suffix = base_path.suffix
-    parent = base_path.parent
-    counter = 1
-    
-    while True:
-        new_name = f"{stem}_{counter}{suffix}"
-        new_path = parent / new_name
-        if not new_path.exists():
-            return new_path
-        counter += 1
+    claimed = reserved if reserved is not None else set()
+    
+    # Existing files are only kept when overwrite is off; batch outputs are always kept
+    output_path = base_path
+    if output_path in claimed or (not overwrite and output_path.exists()):
+        # Find a free name by incrementing suffix
+        stem = base_path.stem
+        suffix = base_path.suffix
+        parent = base_path.parent
+        counter = 1
+        
+        while True:
+            new_name = f"{stem}_{counter}{suffix}"
+            output_path = parent / new_name
+            if output_path not in claimed and (overwrite or not output_path.exists()):
+                break
+            counter += 1
+    
+    if reserved is not None:
+        reserved.add(output_path)
+    return output_path
 
 
 def find_cover_image(source_dir: Path) -> Path | None: